@@ -0,0 +1,69 @@
+import time
+
+
+class DuplicateFilter:
+    """Drop AIS messages already seen from another receiver or channel.
+
+    Messages are keyed on (payload, fill bits) after reassembly, so the same
+    transmission heard by several stations, or on both channel A and B,
+    matches no matter how each receiver numbered its fragments. Keys are held
+    in two rotating generations of at most `max_entries` hashes each: a key
+    is remembered for between one and two `window` periods, and memory stays
+    bounded however fast the feed runs.
+    """
+
+    def __init__(self, window=5.0, max_entries=1000000):
+        self.window = window
+        self.max_entries = max_entries
+        self.current = set()
+        self.previous = set()
+        self.rotated = time.monotonic()
+        self.counters = {"seen": 0, "duplicates": 0, "rotations": 0}
+
+    def _rotate(self, now):
+        self.previous = self.current
+        self.current = set()
+        self.rotated = now
+        self.counters["rotations"] += 1
+
+    def is_duplicate(self, payload, fill_bits=0, now=None):
+        """Record one message and return True if it was already seen within the window."""
+        now = time.monotonic() if now is None else now
+        if now - self.rotated >= self.window or len(self.current) >= self.max_entries:
+            self._rotate(now)
+
+        counters = self.counters
+        counters["seen"] += 1
+        # A 64-bit hash is enough to tell messages apart inside one window
+        key = hash((payload, fill_bits))
+        if key in self.current or key in self.previous:
+            counters["duplicates"] += 1
+            return True
+        self.current.add(key)
+        return False
+
+    @property
+    def hit_rate(self):
+        """Fraction of messages dropped as duplicates so far."""
+        seen = self.counters["seen"]
+        return self.counters["duplicates"] / seen if seen else 0.0
+
+
+if __name__ == "__main__":
+    from AIS.AIS_Reassembly import decode_ais_stream
+
+    nmea_sentences = [
+        # The same Type 1 report heard on channel B by one station and on channel A by another
+        "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*3B",
+        "!AIVDM,1,1,,A,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*38",
+        # Type 5 whose fragments carry a different sequence id at each station
+        "!AIVDM,2,1,3,B,55P5TL01VIaAL@7WKO@mBplU@<PDhh000000001S;AJ::4A80?4i@E53,0*3E",
+        "!AIVDM,2,2,3,B,1@0000000000000,2*55",
+        "!AIVDM,2,1,8,A,55P5TL01VIaAL@7WKO@mBplU@<PDhh000000001S;AJ::4A80?4i@E53,0*36",
+        "!AIVDM,2,2,8,A,1@0000000000000,2*5D",
+    ]
+
+    duplicates = DuplicateFilter()
+    for result in decode_ais_stream(nmea_sentences, duplicates=duplicates):
+        print(result)
+    print(duplicates.counters, f"hit rate {duplicates.hit_rate:.0%}")
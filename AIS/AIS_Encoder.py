@@ -0,0 +1,183 @@
+from binascii import b2a_base64
+from functools import lru_cache
+
+from AIS.AIS_Manual import MESSAGE_SCHEMAS, SIXBIT_ASCII, SIXBIT_MAP, STATIC_DATA_PART_SCHEMAS
+from NMEA.NMEA_Framing import nmea_checksum
+
+# Standard message lengths in bits; other types are as long as their last field
+MESSAGE_BITS = {1: 168, 2: 168, 3: 168, 4: 168, 5: 424, 9: 168, 11: 168, 18: 168, 19: 312, 21: 272, 27: 96}
+STATIC_DATA_PART_BITS = {0: 160, 1: 168}
+
+# Values meaning "not available", used for fields missing from the record
+NOT_AVAILABLE = {
+    "longitude": 181.0,
+    "latitude": 91.0,
+    "speed_over_ground": 102.3,
+    "course_over_ground": 360.0,
+    "true_heading": 511,
+    "utc_time": "0-00-00 24:60:60",
+    "utc_date": "0-00-00",
+}
+
+# Longest payload in one sentence; longer messages are split into fragments
+MAX_FRAGMENT_CHARS = 60
+
+_TEXT_VALUES = {char: index for index, char in enumerate(SIXBIT_ASCII)}
+
+# Base64 also packs 6 bits per character, so armoring is base64 with the alphabet swapped
+_BASE64_TO_SIXBIT = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/", SIXBIT_MAP.encode("ascii"))
+
+
+@lru_cache(maxsize=4096)
+def _encode_text(text, chars):
+    """Pack text into `chars` 6-bit characters, padded with '@'; unknown characters become spaces."""
+    value = 0
+    for char in text.upper()[:chars].ljust(chars, "@"):
+        value = (value << 6) | _TEXT_VALUES.get(char, 32)
+    return value
+
+
+def _pack_utc(text):
+    """Inverse of AIS_Manual._format_utc."""
+    date, time = text.split(" ")
+    year, month, day = map(int, date.split("-"))
+    hour, minute, second = map(int, time.split(":"))
+    return (year << 26) | (month << 22) | (day << 17) | (hour << 12) | (minute << 6) | second
+
+
+def _pack_date(text):
+    """Inverse of AIS_Manual._format_date."""
+    year, month, day = map(int, text.split("-"))
+    return (year << 9) | (month << 5) | day
+
+
+def _field_value(name, offset, width, signed, scale, kind):
+    """Python expression giving the unshifted bits of one field from `get`."""
+    default = NOT_AVAILABLE.get(name, "" if kind in ("text", "bits") else 0)
+    value = f"get({name!r}, {default!r})"
+    if kind == "text":
+        return f"_encode_text({value}, {width // 6})"
+    if kind == "utc":
+        return f"_pack_utc({value})"
+    if kind == "date":
+        return f"_pack_date({value})"
+    if scale is not None:
+        value = f"round({value} * {scale!r})"
+    return f"({value} & {(1 << width) - 1})"
+
+
+def compile_encoder(name, fields, length):
+    """Compile a decoder field table into its inverse.
+
+    The generated function takes a record dict as produced by the matching
+    decoder and returns (value, bits): the message as one integer and its
+    length. Bits not covered by the table are zero. A trailing field without
+    a fixed width (free text or binary data) extends the message.
+    """
+    lines = [f"def {name}(record):", "    get = record.get", "    value = 0"]
+    tail = None
+    for field in fields:
+        field_name, offset, width, signed, scale, kind = field
+        if width is None:
+            tail = field
+            continue
+        lines.append(f"    value |= {_field_value(*field)} << {length - offset - width}")
+
+    if tail is None:
+        lines.append(f"    return value, {length}")
+    elif tail[5] == "text":
+        lines += [f"    text = get({tail[0]!r}, '')",
+                  "    return (value << 6 * len(text)) | _encode_text(text, len(text)), "
+                  f"{length} + 6 * len(text)"]
+    else:
+        lines += [f"    data = get({tail[0]!r}, '')",
+                  f"    return (value << len(data)) | int(data or '0', 2), {length} + len(data)"]
+
+    namespace = {"_encode_text": _encode_text, "_pack_utc": _pack_utc, "_pack_date": _pack_date}
+    exec("\n".join(lines), namespace)
+    encoder = namespace[name]
+    encoder.fields = fields
+    return encoder
+
+
+def _message_bits(message_type, fields):
+    if message_type in MESSAGE_BITS:
+        return MESSAGE_BITS[message_type]
+    # A variable-width tail starts where the fixed part ends
+    return max(offset + (width or 0) for _, offset, width, *_ in fields)
+
+
+STATIC_DATA_PART_ENCODERS = {
+    part: compile_encoder(f"encode_static_data_report_part_{part}", fields, STATIC_DATA_PART_BITS[part])
+    for part, fields in STATIC_DATA_PART_SCHEMAS.items()
+}
+
+
+def _encode_static_data_report(record):
+    """Encode Static Data Report (Type 24), part A or part B."""
+    return STATIC_DATA_PART_ENCODERS[0 if record.get("part_number", 0) == 0 else 1](record)
+
+
+# Type number -> encoder, the inverse of AIS_Manual.DECODERS
+ENCODERS = {
+    message_type: compile_encoder(f"encode_type_{message_type}", fields, _message_bits(message_type, fields))
+    for message_type, fields in MESSAGE_SCHEMAS.items()
+}
+ENCODERS[24] = _encode_static_data_report
+
+
+def binary_to_sixbit(value, length):
+    """Armor a `length`-bit message into (payload, fill_bits); the inverse of sixbit_to_binary."""
+    fill_bits = -length % 6
+    chars = (length + fill_bits) // 6
+    # Pad to whole 3-byte groups; the spare characters are cut off again
+    groups = (chars + 3) // 4
+    value <<= fill_bits + 6 * (4 * groups - chars)
+    armored = b2a_base64(value.to_bytes(3 * groups, "big"), newline=False).translate(_BASE64_TO_SIXBIT)
+    return armored[:chars].decode("ascii"), fill_bits
+
+
+def encode_ais_payload(record):
+    """Encode a decoded-style record dict into (payload, fill_bits)."""
+    return binary_to_sixbit(*ENCODERS[record["message_type"]](record))
+
+
+def encode_ais_message(record, channel="A", sequence_id=0, talker="AIVDM"):
+    """Encode a record into a list of NMEA sentences with checksums.
+
+    Payloads longer than MAX_FRAGMENT_CHARS (such as Type 5) are split over
+    several sentences sharing `sequence_id`; only the last carries fill bits.
+    """
+    payload, fill_bits = encode_ais_payload(record)
+    if len(payload) <= MAX_FRAGMENT_CHARS:
+        body = f"{talker},1,1,,{channel},{payload},{fill_bits}"
+        return [f"!{body}*{nmea_checksum(body):02X}"]
+
+    parts = [payload[i:i + MAX_FRAGMENT_CHARS] for i in range(0, len(payload), MAX_FRAGMENT_CHARS)]
+    sentences = []
+    for number, part in enumerate(parts, 1):
+        body = (f"{talker},{len(parts)},{number},{sequence_id},{channel},{part},"
+                f"{fill_bits if number == len(parts) else 0}")
+        sentences.append(f"!{body}*{nmea_checksum(body):02X}")
+    return sentences
+
+
+if __name__ == "__main__":
+    from AIS.AIS_Reassembly import decode_ais_stream
+
+    records = [
+        {"message_type": 1, "mmsi": 366979118, "longitude": 117.06488, "latitude": 21.693657,
+         "speed_over_ground": 3.4, "course_over_ground": 103.6, "true_heading": 511},
+        {"message_type": 5, "mmsi": 369190000, "imo_number": 6710932, "call_sign": "WDA9674",
+         "ship_name": "MT.MITCHELL", "ship_type": 99, "destination": "SEATTLE"},
+        {"message_type": 24, "mmsi": 271041815, "part_number": 0, "vessel_name": "PROGUY"},
+        {"message_type": 18, "mmsi": 338087471, "longitude": -74.072132, "latitude": 40.684540,
+         "speed_over_ground": 0.1, "course_over_ground": 79.6, "true_heading": 511},
+    ]
+
+    for record in records:
+        sentences = encode_ais_message(record, sequence_id=3)
+        for sentence in sentences:
+            print(sentence)
+        print(next(decode_ais_stream(sentences)))
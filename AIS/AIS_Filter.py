@@ -0,0 +1,77 @@
+from AIS.AIS_Manual import SIXBIT_MAP, SIXBIT_TO_DIGITS
+
+# Type and MMSI sit in bits 0-37, i.e. the first 7 payload characters
+HEADER_CHARS = 7
+
+
+class HeaderFilter:
+    """Accept or drop AIS messages from the payload header alone.
+
+    Only the first character (message type) and the next six (MMSI) are
+    looked at, so messages off the watch list are dropped without unpacking
+    the rest of the payload. Any criterion left as None matches everything,
+so a filter with no criteria passes every payload, however short.
+    mmsi_ranges is a list of inclusive (first, last) pairs, checked when the
+    MMSI is not in the `mmsi` set.
+    """
+
+    def __init__(self, types=None, mmsi=None, mmsi_ranges=None, channels=None):
+        # Allowed types as the payload characters that encode them
+        self.type_chars = None if types is None else frozenset(SIXBIT_MAP[t] for t in types)
+        self.mmsi = None if mmsi is None else frozenset(mmsi)
+        self.mmsi_ranges = None if mmsi_ranges is None else sorted(mmsi_ranges)
+        self.channels = None if channels is None else frozenset(channels)
+        self.counters = {"accepted": 0, "dropped": 0}
+
+    def _mmsi_matches(self, mmsi):
+        if self.mmsi is not None and mmsi in self.mmsi:
+            return True
+        if self.mmsi_ranges is not None:
+            for first, last in self.mmsi_ranges:
+                if first <= mmsi <= last:
+                    return True
+                if first > mmsi:
+                    break
+        return False
+
+    def accepts(self, payload, channel=None):
+        """True if a (reassembled) payload heard on `channel` passes the filter."""
+        counters = self.counters
+        if ((self.channels is not None and channel not in self.channels)
+                or (self.type_chars is not None and payload[:1] not in self.type_chars)):
+            counters["dropped"] += 1
+            return False
+
+        if self.mmsi is not None or self.mmsi_ranges is not None:
+            # A payload too short to hold the whole MMSI cannot match
+            if len(payload) < HEADER_CHARS:
+                counters["dropped"] += 1
+                return False
+            # Characters 1-6 hold bits 6-41; the MMSI is bits 8-37
+            mmsi = (int(payload[1:HEADER_CHARS].translate(SIXBIT_TO_DIGITS), 2) >> 4) & 0x3FFFFFFF
+            if not self._mmsi_matches(mmsi):
+                counters["dropped"] += 1
+                return False
+
+        counters["accepted"] += 1
+        return True
+
+    @property
+    def needs_channel(self):
+        return self.channels is not None
+
+
+if __name__ == "__main__":
+    import time
+
+    from AIS.AIS_Reassembly import decode_ais_stream
+    from AIS.AIS_Simulator import TrafficSimulator
+
+    sentences = [sentence for _, sentence in TrafficSimulator(vessels=5000, start=0).run(600)]
+    watch_list = HeaderFilter(types=(1, 2, 3, 5, 18, 24), mmsi=range(244000000, 244000125))
+
+    for label, prefilter in (("full decode", None), ("watch list", watch_list)):
+        started = time.perf_counter()
+        decoded = sum(1 for _ in decode_ais_stream(sentences, prefilter=prefilter))
+        print(f"{label}: {decoded} of {len(sentences)} sentences decoded in {time.perf_counter() - started:.2f} s")
+    print(watch_list.counters)
@@ -0,0 +1,229 @@
+import heapq
+import math
+import time
+from collections import namedtuple
+
+# Message types carrying a vessel position
+POSITION_TYPES = {1, 2, 3, 18, 19, 27}
+
+EARTH_RADIUS_NM = 3440.065
+
+VesselState = namedtuple("VesselState", ["mmsi", "latitude", "longitude", "sog", "cog", "heading", "updated"])
+
+
+def haversine_nm(lat1, lon1, lat2, lon2):
+    """Great-circle distance in nautical miles."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class FleetTable:
+    """Latest position per MMSI with a uniform lat/lon grid index.
+
+    Each vessel sits in exactly one grid cell; the cell is updated only when
+    a new report moves it across a cell edge, so updates stay O(1) and
+    spatial queries only look at the cells they overlap.
+    """
+
+    def __init__(self, cell_size=0.1):
+        self.cell_size = cell_size
+        self.columns = int(round(360.0 / cell_size))
+        self.rows = int(math.ceil(180.0 / cell_size))
+        self.vessels = {}  # mmsi -> [lat, lon, sog, cog, heading, updated, cell]
+        self.cells = {}    # (row, column) -> set of mmsi
+
+    def __len__(self):
+        return len(self.vessels)
+
+    def _cell(self, lat, lon):
+        row = min(int((lat + 90.0) / self.cell_size), self.rows - 1)
+        column = int((lon + 180.0) / self.cell_size) % self.columns
+        return row, column
+
+    def update(self, record, timestamp=None):
+        """Apply one decoded position report; returns False if it was not usable."""
+        if not isinstance(record, dict) or record.get("message_type") not in POSITION_TYPES:
+            return False
+        lat = record["latitude"]
+        lon = record["longitude"]
+        # 91 / 181 mean "not available"
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+            return False
+
+        mmsi = record["mmsi"]
+        cell = self._cell(lat, lon)
+        updated = time.time() if timestamp is None else timestamp
+        state = self.vessels.get(mmsi)
+
+        if state is None:
+            self.vessels[mmsi] = [lat, lon, record.get("speed_over_ground"), record.get("course_over_ground"),
+                                  record.get("true_heading"), updated, cell]
+            self.cells.setdefault(cell, set()).add(mmsi)
+            return True
+
+        if state[6] != cell:
+            self._unindex(mmsi, state[6])
+            self.cells.setdefault(cell, set()).add(mmsi)
+        state[0:7] = lat, lon, record.get("speed_over_ground"), record.get("course_over_ground"), \
+            record.get("true_heading"), updated, cell
+        return True
+
+    def update_many(self, records, timestamp=None):
+        update = self.update
+        return sum(update(record, timestamp) for record in records)
+
+    def _unindex(self, mmsi, cell):
+        members = self.cells[cell]
+        members.discard(mmsi)
+        if not members:
+            del self.cells[cell]
+
+    def remove(self, mmsi):
+        state = self.vessels.pop(mmsi, None)
+        if state is not None:
+            self._unindex(mmsi, state[6])
+
+    def expire(self, older_than):
+        """Drop vessels whose last report is older than the given timestamp."""
+        stale = [mmsi for mmsi, state in self.vessels.items() if state[5] < older_than]
+        for mmsi in stale:
+            self.remove(mmsi)
+        return len(stale)
+
+    def get(self, mmsi):
+        state = self.vessels.get(mmsi)
+        return None if state is None else VesselState(mmsi, *state[:6])
+
+    def _columns_between(self, min_lon, max_lon):
+        first = int((min_lon + 180.0) / self.cell_size)
+        last = int((max_lon + 180.0) / self.cell_size)
+        if max_lon < min_lon:  # box crosses the antimeridian
+            last += self.columns
+        if last - first + 1 >= self.columns:
+            return range(self.columns)
+        return [column % self.columns for column in range(first, last + 1)]
+
+    def query_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """MMSIs inside the box; min_lon > max_lon means it wraps across 180 degrees."""
+        min_row = self._cell(max(min_lat, -90.0), 0.0)[0]
+        max_row = self._cell(min(max_lat, 90.0), 0.0)[0]
+        wraps = max_lon < min_lon
+        vessels = self.vessels
+        found = []
+        for row in range(min_row, max_row + 1):
+            for column in self._columns_between(min_lon, max_lon):
+                for mmsi in self.cells.get((row, column), ()):
+                    lat, lon = vessels[mmsi][0:2]
+                    if min_lat <= lat <= max_lat and (
+                            (lon >= min_lon or lon <= max_lon) if wraps else min_lon <= lon <= max_lon):
+                        found.append(mmsi)
+        return found
+
+    def query_radius(self, lat, lon, radius_nm):
+        """(distance_nm, mmsi) pairs within radius_nm of a point, nearest first."""
+        lat_span = radius_nm / 60.0
+        min_lat = max(-90.0, lat - lat_span)
+        max_lat = min(90.0, lat + lat_span)
+
+        # A circle reaching a pole covers every longitude near it
+        if abs(lat) + lat_span >= 90.0:
+            lon_span = 180.0
+        else:
+            lon_span = radius_nm / (60.0 * math.cos(math.radians(abs(lat) + lat_span)))
+
+        if lon_span >= 180.0:
+            candidates = self.query_bbox(min_lat, -180.0, max_lat, 180.0)
+        else:
+            min_lon = (lon - lon_span + 180.0) % 360.0 - 180.0
+            max_lon = (lon + lon_span + 180.0) % 360.0 - 180.0
+            candidates = self.query_bbox(min_lat, min_lon, max_lat, max_lon)
+
+        vessels = self.vessels
+        found = []
+        for mmsi in candidates:
+            state = vessels[mmsi]
+            distance = haversine_nm(lat, lon, state[0], state[1])
+            if distance <= radius_nm:
+                found.append((distance, mmsi))
+        found.sort()
+        return found
+
+    def nearest(self, lat, lon, k=1):
+        """The k nearest vessels as (distance_nm, mmsi) pairs, nearest first.
+
+        Searches rings of cells outwards from the query cell and stops once the
+        next ring cannot hold anything closer than the current k-th best. Once a
+        ring would cover more cells than are occupied, the occupied cells left
+        outside the searched square are scanned directly instead, so a query far
+        from a sparse fleet does not walk empty rings.
+        """
+        if not self.vessels:
+            return []
+        row, column = self._cell(lat, lon)
+        columns = self.columns
+        vessels = self.vessels
+        cells = self.cells
+        best = []  # max-heap of (-distance, mmsi)
+        cos_lat = math.cos(math.radians(lat))
+
+        def consider(members):
+            for mmsi in members:
+                state = vessels[mmsi]
+                distance = haversine_nm(lat, lon, state[0], state[1])
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, mmsi))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, mmsi))
+
+        for ring in range(max(self.rows, columns) + 1):
+            # A square this wide is larger than the whole grid well before a ring
+            # could wrap onto itself, so no cell is ever searched twice
+            if (2 * ring + 1) ** 2 > len(cells):
+                for (r, c), members in cells.items():
+                    # Rings 0 .. ring-1 already covered every cell nearer than `ring` steps
+                    if max(abs(r - row), min((c - column) % columns, (column - c) % columns)) >= ring:
+                        consider(members)
+                break
+
+            for r in range(row - ring, row + ring + 1):
+                if not 0 <= r < self.rows:
+                    continue
+                edge = r in (row - ring, row + ring)
+                for c in range(column - ring, column + ring + 1, 1 if edge else 2 * ring):
+                    consider(cells.get((r, c % columns), ()))
+
+            if len(best) == len(vessels):
+                break
+            if len(best) >= k:
+                # Anything unvisited is at least `ring` whole cells away in latitude or
+                # longitude; for longitude, the distance to that meridian is the bound
+                span = math.radians(ring * self.cell_size)
+                bound = EARTH_RADIUS_NM * min(span, math.asin(cos_lat * math.sin(min(span, math.pi / 2))))
+                if -best[0][0] <= bound:
+                    break
+
+        return sorted((-negative, mmsi) for negative, mmsi in best)
+
+
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(0)
+    fleet = FleetTable()
+    for mmsi in range(200000000, 200100000):
+        fleet.update({"message_type": 1, "mmsi": mmsi, "latitude": rng.uniform(-60, 60),
+                      "longitude": rng.uniform(-180, 180), "speed_over_ground": 10.0,
+                      "course_over_ground": 90.0, "true_heading": 90})
+
+    started = time.perf_counter()
+    inside = fleet.query_bbox(50.0, -2.0, 52.0, 2.0)
+    print(f"bbox: {len(inside)} vessels in {(time.perf_counter() - started) * 1000:.3f} ms")
+
+    started = time.perf_counter()
+    nearby = fleet.query_radius(51.0, 0.0, 60.0)
+    print(f"radius: {len(nearby)} vessels in {(time.perf_counter() - started) * 1000:.3f} ms")
+
+    started = time.perf_counter()
+    closest = fleet.nearest(51.0, 0.0, k=10)
+    print(f"nearest: {closest[:3]} in {(time.perf_counter() - started) * 1000:.3f} ms")
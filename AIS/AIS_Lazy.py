@@ -0,0 +1,103 @@
+from AIS.AIS_Manual import (
+    EXPRESSION_GLOBALS, MESSAGE_SCHEMAS, MIN_MESSAGE_BITS, STATIC_DATA_PART_SCHEMAS, field_expression,
+    sixbit_to_binary,
+)
+from NMEA.NMEA_Framing import verify_sentence
+
+
+def compile_field_readers(fields):
+    """Compile a field table into {name: function(bits) -> value}, one reader per field."""
+    namespace = dict(EXPRESSION_GLOBALS)
+    readers = {}
+    for name, *field in fields:
+        readers[name] = eval(f"lambda bits: {field_expression(*field, None)}", namespace)
+    return readers
+
+
+# Type number -> field readers, in the same order as the eager decoders' output
+FIELD_READERS = {message_type: compile_field_readers(fields) for message_type, fields in MESSAGE_SCHEMAS.items()}
+STATIC_DATA_PART_READERS = {part: compile_field_readers(fields) for part, fields in STATIC_DATA_PART_SCHEMAS.items()}
+
+NO_READERS = {}
+
+
+class AISMessage:
+    """An AIS message that decodes its fields only when they are read.
+
+    The payload is unpacked once and message_type and mmsi are read straight
+    away; every other field is decoded on first attribute access and cached.
+    to_dict() returns what decode_ais_payload would: the same dict, or the
+    same string for a type it does not handle.
+    """
+
+    __slots__ = ("message_type", "mmsi", "_bits", "_readers", "_cache")
+
+    def __init__(self, payload, fill_bits=0):
+        bits = sixbit_to_binary(payload, fill_bits)
+        message_type = bits.uint(0, 6)
+        min_bits = MIN_MESSAGE_BITS.get(message_type, 0)
+        if bits.length < min_bits:
+            raise ValueError(f"Binary data is too short: {bits.length} bits (expected {min_bits} bits)")
+
+        self.message_type = message_type
+        self.mmsi = bits.uint(8, 30)
+        self._bits = bits
+        if message_type == 24:
+            self._readers = STATIC_DATA_PART_READERS[0 if bits.uint(38, 2) == 0 else 1]
+        else:
+            self._readers = FIELD_READERS.get(message_type, NO_READERS)
+        self._cache = None
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots, i.e. the lazily decoded fields
+        if name.startswith("_"):
+            raise AttributeError(name)
+        reader = self._readers.get(name)
+        if reader is None:
+            raise AttributeError(f"Message type {self.message_type} has no field {name!r}")
+
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        elif name in cache:
+            return cache[name]
+        value = cache[name] = reader(self._bits)
+        return value
+
+    @property
+    def fields(self):
+        """Names of the fields this message type carries."""
+        return list(self._readers)
+
+    def to_dict(self):
+        """Decode every remaining field and return them all as a dict.
+
+        Types without a decoder give decode_ais_payload's "not handled" string.
+        """
+        if not self._readers:
+            return f"Message type {self.message_type} not handled in this example."
+        return {name: getattr(self, name) for name in self._readers}
+
+    def __repr__(self):
+        return f"AISMessage(message_type={self.message_type}, mmsi={self.mmsi})"
+
+
+def lazy_ais_message(nmea_message):
+    """Like decode_ais_message, but return an AISMessage without decoding any fields yet."""
+    try:
+        fields = verify_sentence(nmea_message).decode("ascii").split(',')
+        fill_bits = int(fields[6][:1] or 0) if len(fields) > 6 else 0
+        return AISMessage(fields[5], fill_bits)
+    except Exception as e:
+        return f"Error decoding message: {e}"
+
+
+if __name__ == "__main__":
+    from AIS.AIS_Manual import nmea_sentences
+
+    for sentence in nmea_sentences:
+        message = lazy_ais_message(sentence)
+        print(message)
+        if isinstance(message, AISMessage) and message.message_type in (1, 2, 3):
+            # Only the fields read here are decoded
+            print("  position:", message.latitude, message.longitude)
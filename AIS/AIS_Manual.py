@@ -1,511 +1,395 @@
-def sixbit_to_binary(payload):
+from NMEA.NMEA_Framing import verify_sentence
+
+SIXBIT_MAP = "0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVW`abcdefghijklmnopqrstuvw"
+
+# AIS 6-bit text alphabet: value 0 is '@' (padding), 32 is space
+SIXBIT_ASCII = "@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_ !\"#$%&'()*+,-./0123456789:;<=>?"
+
+# str.translate table mapping each payload character to its six '0'/'1' digits,
+# so the whole payload becomes one int() call instead of a per-character loop
+SIXBIT_TO_DIGITS = {ord(char): format(index, '06b') for index, char in enumerate(SIXBIT_MAP)}
+
+
+class AISBitReader:
+    """Unpacked AIS payload held as one integer; fields are read with shifts and masks."""
+
+    __slots__ = ("value", "length")
+
+    def __init__(self, payload, fill_bits=0):
+        self.length = len(payload) * 6 - fill_bits
+        self.value = int(payload.translate(SIXBIT_TO_DIGITS), 2) >> fill_bits if payload else 0
+
+    def __len__(self):
+        return self.length
+
+    def _clamp(self, start, width):
+        # Fields running past the end keep whatever bits remain, like a string slice did
+        shift = self.length - start - width
+        if shift < 0:
+            width += shift
+            shift = 0
+            if width <= 0:
+                raise ValueError(f"Field at bit {start} is past the end of a {self.length}-bit payload")
+        return shift, width
+
+    def uint(self, start, width):
+        """Read an unsigned field of `width` bits starting at bit `start`."""
+        shift, width = self._clamp(start, width)
+        return (self.value >> shift) & ((1 << width) - 1)
+
+    def sint(self, start, width):
+        """Read a two's complement signed field."""
+        shift, width = self._clamp(start, width)
+        value = (self.value >> shift) & ((1 << width) - 1)
+        sign = 1 << (width - 1)
+        return (value ^ sign) - sign
+
+    def text(self, start, width):
+        """Read 6-bit AIS text, dropping '@' padding and surrounding spaces."""
+        shift, width = self._clamp(start, width - width % 6)
+        value = self.value >> shift
+        chars = [SIXBIT_ASCII[(value >> s) & 0x3F] for s in range(width - 6, -1, -6)]
+        return "".join(chars).rstrip("@").strip()
+
+    def bits(self, start, end=None):
+        """Return bits [start:end] as a '0'/'1' string."""
+        end = self.length if end is None else min(end, self.length)
+        if end <= start:
+            return ""
+        width = end - start
+        return format((self.value >> (self.length - end)) & ((1 << width) - 1), f'0{width}b')
+
+
+def sixbit_to_binary(payload, fill_bits=0):
     """Convert 6-bit AIS payload to binary."""
-    sixbit_map = "0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVW`abcdefghijklmnopqrstuvw"
-    binary_string = ""
-    
-    for char in payload:
-        index = sixbit_map.index(char)
-        binary_string += format(index, '06b')
-        
-    return binary_string
-
-def decode_position_report(binary_data):
-    """Decode AIS position report (Types 1, 2, 3)."""
-    mmsi = int(binary_data[8:38], 2)
-    longitude = int(binary_data[61:89], 2) / 600000.0
-    latitude = int(binary_data[89:116], 2) / 600000.0
-    speed_over_ground = int(binary_data[50:60], 2) / 10.0
-    course_over_ground = int(binary_data[116:128], 2) / 10.0
-    true_heading = int(binary_data[128:137], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "longitude": longitude,
-        "latitude": latitude,
-        "speed_over_ground": speed_over_ground,
-        "course_over_ground": course_over_ground,
-        "true_heading": true_heading,
-    }
-
-
-def decode_static_voyage_data(binary_data):
-    """Decode Static and Voyage Related Data (Type 5)."""
-    try:
-        # Ensure binary data is long enough (424 bits)
-        if len(binary_data) < 424:
-            raise ValueError(f"Binary data is too short: {len(binary_data)} bits (expected 424 bits)")
-        
-        # Decode MMSI (Maritime Mobile Service Identity)
-        mmsi = int(binary_data[8:38], 2)
-        
-        # Decode IMO number (International Maritime Organization number)
-        imo_number = int(binary_data[40:70], 2)
-        
-        # Decode Call Sign
-        call_sign = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(70, 112, 6)]).strip()
-        
-        # Decode Ship Name
-        ship_name = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(112, 232, 6)]).strip()
-        
-        # Decode Destination
-        destination = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(302, 422, 6)]).strip()
-
-        # Return decoded information as a dictionary
-        return {
-            "message_type": int(binary_data[0:6], 2),
-            "mmsi": mmsi,
-            "imo_number": imo_number,
-            "call_sign": call_sign,
-            "ship_name": ship_name,
-            "destination": destination,
-        }
-    except ValueError as ve:
-        print(f"Error decoding static voyage data: {ve}")
-    except Exception as e:
-        print(f"An unexpected error occurred while decoding: {e}")
-        return None
-
-
-def decode_base_station_report(binary_data):
-    """Decode Base Station Report (Type 4)."""
-    mmsi = int(binary_data[8:38], 2)
-    utc_year = int(binary_data[38:52], 2)
-    utc_month = int(binary_data[52:56], 2)
-    utc_day = int(binary_data[56:61], 2)
-    utc_hour = int(binary_data[61:66], 2)
-    utc_minute = int(binary_data[66:72], 2)
-    utc_second = int(binary_data[72:78], 2)
-    longitude = int(binary_data[79:107], 2) / 600000.0
-    latitude = int(binary_data[107:134], 2) / 600000.0
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "utc_time": f"{utc_year}-{utc_month:02d}-{utc_day:02d} {utc_hour:02d}:{utc_minute:02d}:{utc_second:02d}",
-        "longitude": longitude,
-        "latitude": latitude,
-    }
-
-
-def decode_binary_addressed(binary_data):
-    """Decode Binary Addressed Message (Type 6)."""
-    mmsi = int(binary_data[8:38], 2)
-    seq_num = int(binary_data[38:40], 2)
-    destination_mmsi = int(binary_data[40:70], 2)
-    retransmit_flag = int(binary_data[70], 2)
-    spare = int(binary_data[71:72], 2)
-    application_id = int(binary_data[72:88], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "sequence_number": seq_num,
-        "destination_mmsi": destination_mmsi,
-        "retransmit_flag": retransmit_flag,
-        "application_id": application_id
-    }
-
-def decode_binary_acknowledge(binary_data):
-    """Decode Binary Acknowledge (Type 7)."""
-    try:
-        # AIS Type 7 message has a fixed length of 88 bits
-        if len(binary_data) < 88:
-            raise ValueError("Binary data is too short: expected at least 88 bits")
-
-        # Extract MMSI and sequence numbers from the binary data
-        mmsi_1 = int(binary_data[8:38], 2)
-        sequence_number_1 = int(binary_data[40:48], 2)
-        mmsi_2 = int(binary_data[48:78], 2)
-        sequence_number_2 = int(binary_data[80:88], 2)
-
-        return {
-            "message_type": 7,
-            "mmsi_1": mmsi_1,
-            "sequence_number_1": sequence_number_1,
-            "mmsi_2": mmsi_2,
-            "sequence_number_2": sequence_number_2,
-        }
+    return AISBitReader(payload, fill_bits)
+
+
+# Field tables: (name, offset, width, signed, scale, kind) per message type.
+# kind is "int", "text" (6-bit ASCII), "bits" (raw '0'/'1' string), "utc"
+# (packed year..second, 40 bits) or "date" (packed year/month/day, 23 bits).
+# A width of None runs to the end of the payload.
+POSITION_REPORT_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("longitude", 61, 28, True, 600000.0, "int"),
+    ("latitude", 89, 27, True, 600000.0, "int"),
+    ("speed_over_ground", 50, 10, False, 10.0, "int"),
+    ("course_over_ground", 116, 12, False, 10.0, "int"),
+    ("true_heading", 128, 9, False, None, "int"),
+]
 
-    except Exception as e:
-        print(f"Error decoding binary acknowledge: {e}")
-        return None
-    
+BASE_STATION_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("utc_time", 38, 40, False, None, "utc"),
+    ("longitude", 79, 28, True, 600000.0, "int"),
+    ("latitude", 107, 27, True, 600000.0, "int"),
+]
 
-def decode_binary_broadcast(binary_data):
-    """Decode Binary Broadcast Message (Type 8)."""
-    mmsi = int(binary_data[8:38], 2)
-    application_id = int(binary_data[40:56], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "application_id": application_id
-    }
-
-
-def decode_sar_aircraft_position(binary_data):
-    """Decode Standard SAR Aircraft Position Report (Type 9)."""
-    mmsi = int(binary_data[8:38], 2)
-    altitude = int(binary_data[38:50], 2)
-    speed_over_ground = int(binary_data[50:60], 2) / 10.0
-    longitude = int(binary_data[61:89], 2) / 600000.0
-    latitude = int(binary_data[89:116], 2) / 600000.0
-    course_over_ground = int(binary_data[116:128], 2) / 10.0
-    true_heading = int(binary_data[128:137], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "altitude": altitude,
-        "longitude": longitude,
-        "latitude": latitude,
-        "speed_over_ground": speed_over_ground,
-        "course_over_ground": course_over_ground,
-        "true_heading": true_heading,
-    }
-
-
-def decode_utc_date_inquiry(binary_data):
-    """Decode UTC and Date Inquiry (Type 10)."""
-    mmsi = int(binary_data[8:38], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi
-    }
-
-
-def decode_addressed_safety(binary_data):
-    """Decode Addressed Safety-Related Message (Type 12)."""
-    mmsi = int(binary_data[8:38], 2)
-    seq_num = int(binary_data[38:40], 2)
-    destination_mmsi = int(binary_data[40:70], 2)
-    retransmit_flag = int(binary_data[70], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "sequence_number": seq_num,
-        "destination_mmsi": destination_mmsi,
-        "retransmit_flag": retransmit_flag
-    }
-
-
-def decode_interrogation(binary_data):
-    """Decode Interrogation (Type 15)."""
-    mmsi = int(binary_data[8:38], 2)
-    interrogated_mmsi = int(binary_data[40:70], 2)
-
-    return {
-        "message_type": int(binary_data[0:6], 2),
-        "mmsi": mmsi,
-        "interrogated_mmsi": interrogated_mmsi
-    }
-
-
-def decode_static_data_report(binary_data):
-    """Decode Static Data Report (Type 24)."""
-    mmsi = int(binary_data[8:38], 2)
-    part_number = int(binary_data[38:40], 2)
-
-    if part_number == 0:
-        vessel_name = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(40, 160, 6)]).strip()
-        return {
-            "message_type": int(binary_data[0:6], 2),
-            "mmsi": mmsi,
-            "vessel_name": vessel_name
-        }
-    else:
-        ship_type = int(binary_data[40:48], 2)
-        vendor_id = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(48, 90, 6)]).strip()
-        return {
-            "message_type": int(binary_data[0:6], 2),
-            "mmsi": mmsi,
-            "ship_type": ship_type,
-            "vendor_id": vendor_id
-        }
-
-def decode_base_station_report_utc(binary_data):
-    """Decode UTC and Date Response (Type 11)."""
-    mmsi = int(binary_data[8:38], 2)
-    utc_year = int(binary_data[38:52], 2)
-    utc_month = int(binary_data[52:56], 2)
-    utc_day = int(binary_data[56:61], 2)
-    utc_hour = int(binary_data[61:66], 2)
-    utc_minute = int(binary_data[66:72], 2)
-    utc_second = int(binary_data[72:78], 2)
-    longitude = int(binary_data[79:107], 2) / 600000.0
-    latitude = int(binary_data[107:134], 2) / 600000.0
-
-    return {
-        "message_type": 11,
-        "mmsi": mmsi,
-        "utc_time": f"{utc_year}-{utc_month:02d}-{utc_day:02d} {utc_hour:02d}:{utc_minute:02d}:{utc_second:02d}",
-        "longitude": longitude,
-        "latitude": latitude,
-    }
-
-
-def decode_safety_broadcast(binary_data):
-    """Decode Safety Broadcast Message (Type 14)."""
-    mmsi = int(binary_data[8:38], 2)
-    safety_text = "".join([chr(int(binary_data[i:i + 6], 2)) for i in range(40, len(binary_data), 6)]).strip()
-
-    return {
-        "message_type": 14,
-        "mmsi": mmsi,
-        "safety_text": safety_text
-    }
-
-
-def decode_acknowledge(binary_data):
-    """Decode Binary Acknowledge Message (Type 13)."""
-    mmsi = int(binary_data[8:38], 2)
-    dest_mmsi1 = int(binary_data[40:70], 2)
-
-    return {
-        "message_type": 13,
-        "mmsi": mmsi,
-        "acknowledged_mmsi": dest_mmsi1
-    }
-
-
-def decode_assignment(binary_data):
-    """Decode Assignment Mode Command (Type 16)."""
-    mmsi = int(binary_data[8:38], 2)
-    assigned_mmsi1 = int(binary_data[40:70], 2)
-
-    return {
-        "message_type": 16,
-        "mmsi": mmsi,
-        "assigned_mmsi_1": assigned_mmsi1
-    }
-
-
-def decode_dgnss_binary(binary_data):
-    """Decode DGNSS Binary Broadcast (Type 17)."""
-    mmsi = int(binary_data[8:38], 2)
-    longitude = int(binary_data[40:61], 2) / 600
-    latitude = int(binary_data[61:82], 2) / 600
-
-    return {
-        "message_type": 17,
-        "mmsi": mmsi,
-        "longitude": longitude,
-        "latitude": latitude
-    }
-
-
-def decode_gps_correction(binary_data):
-    """Decode GPS Correction Report (Type 18)."""
-    mmsi = int(binary_data[8:38], 2)
-    longitude = int(binary_data[61:89], 2) / 600000.0
-    latitude = int(binary_data[89:116], 2) / 600000.0
-    speed_over_ground = int(binary_data[50:60], 2) / 10.0
-    course_over_ground = int(binary_data[116:128], 2) / 10.0
-    true_heading = int(binary_data[128:137], 2)
-
-    return {
-        "message_type": 18,
-        "mmsi": mmsi,
-        "longitude": longitude,
-        "latitude": latitude,
-        "speed_over_ground": speed_over_ground,
-        "course_over_ground": course_over_ground,
-        "true_heading": true_heading,
-    }
-
-
-def decode_cpa_warning(binary_data):
-    """Decode CPA Warning (Type 19)."""
-    mmsi = int(binary_data[8:38], 2)
-    longitude = int(binary_data[61:89], 2) / 600000.0
-    latitude = int(binary_data[89:116], 2) / 600000.0
-    speed_over_ground = int(binary_data[50:60], 2) / 10.0
-    course_over_ground = int(binary_data[116:128], 2) / 10.0
-
-    return {
-        "message_type": 19,
-        "mmsi": mmsi,
-        "longitude": longitude,
-        "latitude": latitude,
-        "speed_over_ground": speed_over_ground,
-        "course_over_ground": course_over_ground,
-    }
-
-
-def decode_utc_inquiry(binary_data):
-    """Decode UTC and Date Inquiry (Type 20)."""
-    mmsi = int(binary_data[8:38], 2)
-    utc_year = int(binary_data[38:52], 2)
-    utc_month = int(binary_data[52:56], 2)
-    utc_day = int(binary_data[56:61], 2)
-
-    return {
-        "message_type": 20,
-        "mmsi": mmsi,
-        "utc_date": f"{utc_year}-{utc_month:02d}-{utc_day:02d}"
-    }
-
-
-def decode_static_vessel(binary_data):
-    """Decode Static Vessel Data (Type 21)."""
-    mmsi = int(binary_data[8:38], 2)
-    vessel_name = "".join([chr(int(binary_data[i:i + 6], 2) + 64) for i in range(40, 160, 6)]).strip()
-
-    return {
-        "message_type": 21,
-        "mmsi": mmsi,
-        "vessel_name": vessel_name
-    }
-
-
-def decode_single_slot(binary_data):
-    """Decode Single Slot Binary Message (Type 23)."""
-    mmsi = int(binary_data[8:38], 2)
-
-    return {
-        "message_type": 23,
-        "mmsi": mmsi
-    }
-def decode_static_data_report(binary_data):
-    """Decode Static Data Report (Type 24)."""
-    mmsi = int(binary_data[8:38], 2)
-    part_number = int(binary_data[38:40], 2)
-    if part_number == 0:
-        vessel_name = "".join([chr(int(binary_data[i:i + 6], 2)) for i in range(40, 160, 6)]).strip()
-        return {
-            "message_type": 24,
-            "mmsi": mmsi,
-            "part_number": part_number,
-            "vessel_name": vessel_name
-        }
+STATIC_VOYAGE_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("imo_number", 40, 30, False, None, "int"),
+    ("call_sign", 70, 42, False, None, "text"),
+    ("ship_name", 112, 120, False, None, "text"),
+    ("ship_type", 232, 8, False, None, "int"),
+    ("destination", 302, 120, False, None, "text"),
+]
+
+ADDRESSED_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("sequence_number", 38, 2, False, None, "int"),
+    ("destination_mmsi", 40, 30, False, None, "int"),
+    ("retransmit_flag", 70, 1, False, None, "int"),
+]
+
+BINARY_ACKNOWLEDGE_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi_1", 8, 30, False, None, "int"),
+    ("sequence_number_1", 40, 8, False, None, "int"),
+    ("mmsi_2", 48, 30, False, None, "int"),
+    ("sequence_number_2", 80, 8, False, None, "int"),
+]
+
+SAR_AIRCRAFT_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("altitude", 38, 12, False, None, "int"),
+    ("longitude", 61, 28, True, 600000.0, "int"),
+    ("latitude", 89, 27, True, 600000.0, "int"),
+    ("speed_over_ground", 50, 10, False, 10.0, "int"),
+    ("course_over_ground", 116, 12, False, 10.0, "int"),
+    ("true_heading", 128, 9, False, None, "int"),
+]
+
+# Types 18 and 19 use the Class B layout, which differs from Types 1-3
+CLASS_B_POSITION_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("longitude", 57, 28, True, 600000.0, "int"),
+    ("latitude", 85, 27, True, 600000.0, "int"),
+    ("speed_over_ground", 46, 10, False, 10.0, "int"),
+    ("course_over_ground", 112, 12, False, 10.0, "int"),
+]
+
+SLOT_BINARY_FIELDS = [
+    ("message_type", 0, 6, False, None, "int"),
+    ("mmsi", 8, 30, False, None, "int"),
+    ("application_identifier", 40, 16, False, None, "int"),
+    ("data_payload", 56, None, False, None, "bits"),
+]
+
+MESSAGE_SCHEMAS = {
+    1: POSITION_REPORT_FIELDS,
+    2: POSITION_REPORT_FIELDS,
+    3: POSITION_REPORT_FIELDS,
+    4: BASE_STATION_FIELDS,
+    5: STATIC_VOYAGE_FIELDS,
+    6: ADDRESSED_FIELDS + [
+        ("application_id", 72, 16, False, None, "int"),
+    ],
+    7: BINARY_ACKNOWLEDGE_FIELDS,
+    8: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("application_id", 40, 16, False, None, "int"),
+    ],
+    9: SAR_AIRCRAFT_FIELDS,
+    10: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+    ],
+    11: BASE_STATION_FIELDS,
+    12: ADDRESSED_FIELDS,
+    13: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("acknowledged_mmsi", 40, 30, False, None, "int"),
+    ],
+    14: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("safety_text", 40, None, False, None, "text"),
+    ],
+    15: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("interrogated_mmsi", 40, 30, False, None, "int"),
+    ],
+    16: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("assigned_mmsi_1", 40, 30, False, None, "int"),
+    ],
+    17: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("longitude", 40, 21, True, 600.0, "int"),
+        ("latitude", 61, 21, True, 600.0, "int"),
+    ],
+    18: CLASS_B_POSITION_FIELDS + [
+        ("true_heading", 124, 9, False, None, "int"),
+    ],
+    19: CLASS_B_POSITION_FIELDS,
+    20: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("utc_date", 38, 23, False, None, "date"),
+    ],
+    21: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("vessel_name", 40, 120, False, None, "text"),
+    ],
+    23: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+    ],
+    25: SLOT_BINARY_FIELDS,
+    26: SLOT_BINARY_FIELDS,
+    27: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("position_accuracy", 38, 1, False, None, "int"),
+        ("raim_flag", 39, 1, False, None, "int"),
+        ("longitude", 40, 19, True, 600.0, "int"),
+        ("latitude", 59, 19, True, 600.0, "int"),
+        ("speed_over_ground", 78, 7, False, 10.0, "int"),
+        ("course_over_ground", 85, 9, False, 10.0, "int"),
+        ("gnss_position_status", 94, 1, False, None, "int"),
+    ],
+}
+
+# Type 24 has two layouts, picked by the part number in bits 38-40
+STATIC_DATA_PART_SCHEMAS = {
+    0: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("part_number", 38, 2, False, None, "int"),
+        ("vessel_name", 40, 120, False, None, "text"),
+    ],
+    1: [
+        ("message_type", 0, 6, False, None, "int"),
+        ("mmsi", 8, 30, False, None, "int"),
+        ("part_number", 38, 2, False, None, "int"),
+        ("ship_type", 40, 8, False, None, "int"),
+        ("vendor_id", 48, 42, False, None, "text"),
+        ("callsign", 90, 42, False, None, "text"),
+    ],
+}
+
+# Messages shorter than this are rejected instead of partially decoded
+MIN_MESSAGE_BITS = {5: 424, 7: 88}
+
+
+def _format_utc(packed):
+    """Format a packed 40-bit year/month/day/hour/minute/second field."""
+    return (f"{packed >> 26}-{(packed >> 22) & 0xF:02d}-{(packed >> 17) & 0x1F:02d} "
+            f"{(packed >> 12) & 0x1F:02d}:{(packed >> 6) & 0x3F:02d}:{packed & 0x3F:02d}")
+
+
+def _format_date(packed):
+    """Format a packed 23-bit year/month/day field."""
+    return f"{packed >> 9}-{(packed >> 5) & 0xF:02d}-{packed & 0x1F:02d}"
+
+
+# Globals the expressions from field_expression() refer to
+EXPRESSION_GLOBALS = {"_format_utc": _format_utc, "_format_date": _format_date}
+
+
+def field_expression(offset, width, signed, scale, kind, inline_end):
+    """Python expression reading one field, inline on `word` when inline_end is set.
+
+    The expression reads an AISBitReader named `bits`; evaluate it with
+    EXPRESSION_GLOBALS.
+    """
+    if kind == "text":
+        return f"bits.text({offset}, {'bits.length - ' + str(offset) if width is None else width})"
+    if kind == "bits":
+        return f"bits.bits({offset}{'' if width is None else ', ' + str(offset + width)})"
+
+    if inline_end is None:
+        expression = f"bits.{'sint' if signed else 'uint'}({offset}, {width})"
     else:
-        ship_type = int(binary_data[40:48], 2)
-        vendor_id = "".join([chr(int(binary_data[i:i + 6], 2)) for i in range(48, 90, 6)]).strip()
-        callsign = "".join([chr(int(binary_data[i:i + 6], 2)) for i in range(90, 132, 6)]).strip()
-        return {
-            "message_type": 24,
-            "mmsi": mmsi,
-            "part_number": part_number,
-            "ship_type": ship_type,
-            "vendor_id": vendor_id,
-            "callsign": callsign
-        }
-
-def decode_single_slot_binary(binary_data):
-    """Decode Single Slot Binary Message (Type 25)."""
-    mmsi = int(binary_data[8:38], 2)
-    application_identifier = int(binary_data[40:56], 2)
-    data_payload = binary_data[56:]
-
-    return {
-        "message_type": 25,
-        "mmsi": mmsi,
-        "application_identifier": application_identifier,
-        "data_payload": data_payload
-    }
-
-def decode_multiple_slot_binary(binary_data):
-    """Decode Multiple Slot Binary Message (Type 26)."""
-    mmsi = int(binary_data[8:38], 2)
-    application_identifier = int(binary_data[40:56], 2)
-    data_payload = binary_data[56:]
-
-    return {
-        "message_type": 26,
-        "mmsi": mmsi,
-        "application_identifier": application_identifier,
-        "data_payload": data_payload
-    }
-
-def decode_long_range(binary_data):
-    """Decode Long Range AIS Broadcast Message (Type 27)."""
-    mmsi = int(binary_data[8:38], 2)
-    position_accuracy = int(binary_data[38:39], 2)
-    raim_flag = int(binary_data[39:40], 2)
-    longitude = int(binary_data[40:59], 2) / 600.0
-    latitude = int(binary_data[59:78], 2) / 600.0
-    speed_over_ground = int(binary_data[78:85], 2) / 10.0
-    course_over_ground = int(binary_data[85:94], 2) / 10.0
-    gnss_position_status = int(binary_data[94:95], 2)
-
-    return {
-        "message_type": 27,
-        "mmsi": mmsi,
-        "position_accuracy": position_accuracy,
-        "raim_flag": raim_flag,
-        "longitude": longitude,
-        "latitude": latitude,
-        "speed_over_ground": speed_over_ground,
-        "course_over_ground": course_over_ground,
-        "gnss_position_status": gnss_position_status
-    }
+        shift = inline_end - offset - width
+        expression = f"((word >> {shift}) & {(1 << width) - 1})"
+        if signed:
+            sign = 1 << (width - 1)
+            expression = f"(({expression} ^ {sign}) - {sign})"
+
+    if kind == "utc":
+        return f"_format_utc({expression})"
+    if kind == "date":
+        return f"_format_date({expression})"
+    if scale is not None:
+        return f"{expression} / {scale!r}"
+    return expression
+
+
+def compile_schema(name, fields, min_bits=0):
+    """Compile a field table into a decoder function taking an AISBitReader.
+
+    Fixed-width fields are read with inline shifts from a single word when the
+    payload is long enough; short payloads fall back to the clamping reader
+    methods so they decode the same way a string slice would.
+    """
+    fixed = [field for field in fields if field[2] is not None and field[5] not in ("text", "bits")]
+    end = max((offset + width for _, offset, width, *_ in fixed), default=0)
+
+    def body(inline_end, indent):
+        return [f"{indent}return {{",
+                *[f"{indent}    {field[0]!r}: {field_expression(*field[1:], inline_end)}," for field in fields],
+                f"{indent}}}"]
+
+    lines = [f"def {name}(bits):"]
+    if min_bits:
+        lines += [f"    if bits.length < {min_bits}:",
+                  f"        raise ValueError(f\"Binary data is too short: {{bits.length}} bits (expected {min_bits} bits)\")"]
+    lines += [f"    if bits.length >= {end}:",
+              f"        word = bits.value >> (bits.length - {end})",
+              *body(end, "        "),
+              *body(None, "    ")]
+
+    namespace = dict(EXPRESSION_GLOBALS)
+    # Named after the decoder so profiles and tracebacks say which one
+    exec(compile("\n".join(lines), f"<{name}>", "exec"), namespace)
+    decoder = namespace[name]
+    decoder.fields = fields
+    return decoder
+
+
+def _decode_static_data_report(bits):
+    """Decode Static Data Report (Type 24), part A or part B."""
+    return STATIC_DATA_PART_DECODERS[0 if bits.uint(38, 2) == 0 else 1](bits)
+
+
+STATIC_DATA_PART_DECODERS = {
+    part: compile_schema(f"decode_static_data_report_part_{part}", fields)
+    for part, fields in STATIC_DATA_PART_SCHEMAS.items()
+}
+
+# Type number -> decoder, built once at import
+DECODERS = {
+    message_type: compile_schema(f"decode_type_{message_type}", fields, MIN_MESSAGE_BITS.get(message_type, 0))
+    for message_type, fields in MESSAGE_SCHEMAS.items()
+}
+DECODERS[24] = _decode_static_data_report
+
+# Named decoders for callers that want a specific layout
+decode_position_report = DECODERS[1]
+decode_base_station_report = DECODERS[4]
+decode_static_voyage_data = DECODERS[5]
+decode_binary_addressed = DECODERS[6]
+decode_binary_acknowledge = DECODERS[7]
+decode_binary_broadcast = DECODERS[8]
+decode_sar_aircraft_position = DECODERS[9]
+decode_utc_date_inquiry = DECODERS[10]
+decode_base_station_report_utc = DECODERS[11]
+decode_addressed_safety = DECODERS[12]
+decode_acknowledge = DECODERS[13]
+decode_safety_broadcast = DECODERS[14]
+decode_interrogation = DECODERS[15]
+decode_assignment = DECODERS[16]
+decode_dgnss_binary = DECODERS[17]
+decode_gps_correction = DECODERS[18]
+decode_cpa_warning = DECODERS[19]
+decode_utc_inquiry = DECODERS[20]
+decode_static_vessel = DECODERS[21]
+decode_single_slot = DECODERS[23]
+decode_static_data_report = DECODERS[24]
+decode_single_slot_binary = DECODERS[25]
+decode_multiple_slot_binary = DECODERS[26]
+decode_long_range = DECODERS[27]
+
+
+def decode_ais_payload(payload, fill_bits=0):
+    """Decode an already extracted (and, if needed, reassembled) AIS payload."""
+    # Convert 6-bit encoded payload to binary
+    bits = sixbit_to_binary(payload, fill_bits)
+
+    # Decode message based on the message type
+    message_type = bits.uint(0, 6)
+    decoder = DECODERS.get(message_type)
+    if decoder is None:
+        return f"Message type {message_type} not handled in this example."
+    return decoder(bits)
+
 
 def decode_ais_message(nmea_message):
     """Decode AIS message manually without pyais."""
     try:
+        # Reject corrupt sentences before splitting or bit decoding; split the
+        # bare sentence so a leading NMEA 4 tag block does not shift the fields
+        nmea_message = verify_sentence(nmea_message).decode("ascii")
+
         # Split NMEA sentence and extract the payload (5th field in the sentence)
         fields = nmea_message.split(',')
         payload = fields[5]
+        fill_bits = int(fields[6][:1] or 0) if len(fields) > 6 else 0
 
-        # Convert 6-bit encoded payload to binary
-        binary_data = sixbit_to_binary(payload)
-
-        # Decode message based on the message type
-        message_type = int(binary_data[0:6], 2)
-
-        if message_type in [1, 2, 3]:
-            return decode_position_report(binary_data)
-        elif message_type == 5:
-            return decode_static_voyage_data(binary_data)
-        elif message_type == 4:
-            return decode_base_station_report(binary_data)
-        elif message_type == 6:
-            return decode_binary_addressed(binary_data)
-        elif message_type == 8:
-            return decode_binary_broadcast(binary_data)
-        elif message_type == 7:
-            return decode_binary_acknowledge(binary_data)
-        elif message_type == 9:
-            return decode_sar_aircraft_position(binary_data)
-        elif message_type == 10:
-            return decode_utc_date_inquiry(binary_data)
-        elif message_type == 11:
-            return decode_base_station_report_utc(binary_data)
-        elif message_type == 12:
-            return decode_addressed_safety(binary_data)
-        elif message_type == 13:
-            return decode_acknowledge(binary_data)
-        elif message_type == 14:
-            return decode_safety_broadcast(binary_data)
-        elif message_type == 15:
-            return decode_interrogation(binary_data)
-        elif message_type == 16:
-            return decode_assignment(binary_data)
-        elif message_type == 17:
-            return decode_dgnss_binary(binary_data)
-        elif message_type == 18:
-            return decode_gps_correction(binary_data)
-        elif message_type == 19:
-            return decode_cpa_warning(binary_data)
-        elif message_type == 20:
-            return decode_utc_inquiry(binary_data)
-        elif message_type == 21:
-            return decode_static_vessel(binary_data)
-        elif message_type == 23:
-            return decode_single_slot(binary_data)
-        elif message_type == 24:
-            return decode_static_data_report(binary_data)
-        elif message_type == 25:
-            return decode_single_slot_binary(binary_data)
-        elif message_type == 26:
-            return decode_multiple_slot_binary(binary_data)
-        elif message_type == 27:
-            return decode_long_range(binary_data)
-        else:
-            return f"Message type {message_type} not handled in this example."
+        return decode_ais_payload(payload, fill_bits)
 
     except Exception as e:
         return f"Error decoding message: {e}"
@@ -513,35 +397,36 @@ def decode_ais_message(nmea_message):
 # Example Usage
 nmea_sentences = [
     # Type 1, 2, or 3 - Position Report
-    "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*6C",  
+    "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*3B",  
 
     # Type 4 - Base Station Report
-    "!AIVDM,1,1,,B,402P?v1vS13j@<:O<UQEqgvN0000,0*1F",  
+    "!AIVDM,1,1,,B,402P?v1vS13j@<:O<UQEqgvN0000,0*2C",  
 
     # Type 5 - Static and Voyage Related Data
     "!AIVDM,1,1,,A,13q5W0PP1fQEpJVO9V>pIVgp0D7k,0*66",  
     
     # Type 6 - Addressed Binary Message
-    "!AIVDM,1,1,,A,64:Ijv00000H1K3o2Tf:a000,0*5C",
+    "!AIVDM,1,1,,A,64:Ijv00000H1K3o2Tf:a000,0*7E",
 
     # Type 7 - Binary Acknowledge
-    "!AIVDM,1,1,,A,15Mw9g0P0L00C0>2>P;F@=0P00,0*1C",
+    "!AIVDM,1,1,,A,15Mw9g0P0L00C0>2>P;F@=0P00,0*2B",
 
     # Type 9 - Standard SAR Aircraft Position Report
-    "!AIVDM,1,1,,A,902:P=B1w;fRRVRe2rh0,0*34",
+    "!AIVDM,1,1,,A,902:P=B1w;fRRVRe2rh0,0*6A",
 
     # Type 10 - UTC/Date Inquiry
-    "!AIVDM,1,1,,A,A0SEbdP00000Mwj,0*27",
+    "!AIVDM,1,1,,A,A0SEbdP00000Mwj,0*77",
 
     # Type 11 - UTC/Date Response
-    "!AIVDM,1,1,,B,B0E8A=B8=EBDF00M00G00000,0*48",
+    "!AIVDM,1,1,,B,B0E8A=B8=EBDF00M00G00000,0*2E",
 
     # Type 18 - Standard Class B Equipment Position Report
-    "!AIVDM,1,1,,B,15NJ0E1P00RHDLDGww8V1?vN0000,0*60",
+    "!AIVDM,1,1,,B,15NJ0E1P00RHDLDGww8V1?vN0000,0*78",
 
     # Type 24 - Static Data Report
-    "!AIVDM,1,1,,B,24NjQa000001wvRD5Q??Uww2:RO,0*51",
+    "!AIVDM,1,1,,B,24NjQa000001wvRD5Q??Uww2:RO,0*05",
 ]
 
-for sentence in nmea_sentences:
-    print(decode_ais_message(sentence))
+if __name__ == "__main__":
+    for sentence in nmea_sentences:
+        print(decode_ais_message(sentence))
@@ -0,0 +1,130 @@
+import time
+from collections import OrderedDict
+
+from AIS.AIS_Manual import decode_ais_payload
+from NMEA.NMEA_Framing import verify_sentence
+
+
+class FragmentReassembler:
+    """Join multi-sentence AIVDM/AIVDO messages back into one payload.
+
+    Partial groups are keyed by (source, channel, sequential message id,
+    fragment count). At most `max_groups` are buffered; the oldest is evicted
+    when a new group would exceed that, and groups older than `timeout`
+    seconds are expired.
+    """
+
+    def __init__(self, max_groups=1024, timeout=10.0):
+        self.max_groups = max_groups
+        self.timeout = timeout
+        self.groups = OrderedDict()  # key -> [started, parts, received, fill bits of the last fragment]
+        self.counters = {
+            "single": 0,       # one-sentence messages passed straight through
+            "completed": 0,    # multi-sentence messages reassembled
+            "orphans": 0,      # fragments with no group to join (start lost or expired)
+            "duplicates": 0,   # fragment numbers seen twice in one group
+            "restarted": 0,    # groups abandoned because fragment 1 arrived again
+            "evicted": 0,      # groups dropped because the buffer was full
+            "expired": 0,      # groups dropped because they timed out
+        }
+
+    def expire(self, now=None):
+        """Drop partial groups older than the timeout."""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.timeout
+        groups = self.groups
+        # Groups are kept in start order, so only the front needs checking
+        while groups:
+            key, group = next(iter(groups.items()))
+            if group[0] > cutoff:
+                break
+            del groups[key]
+            self.counters["expired"] += 1
+
+    def add(self, nmea_message, source="", now=None):
+        """Feed one sentence; return (payload, fill_bits) once a message is complete, else None."""
+        fields = nmea_message.split(',')
+        count = int(fields[1])
+        number = int(fields[2])
+        payload = fields[5]
+        fill_bits = int(fields[6][:1] or 0) if len(fields) > 6 else 0
+
+        if count == 1:
+            self.counters["single"] += 1
+            return payload, fill_bits
+
+        now = time.monotonic() if now is None else now
+        self.expire(now)
+
+        key = (source, fields[4], fields[3], count)
+        group = self.groups.get(key)
+
+        if number == 1:
+            if group is not None:
+                self.counters["restarted"] += 1
+                del self.groups[key]
+            if len(self.groups) >= self.max_groups:
+                self.groups.popitem(last=False)
+                self.counters["evicted"] += 1
+            group = self.groups[key] = [now, [None] * count, 0, 0]
+        elif group is None or not 1 <= number <= count:
+            self.counters["orphans"] += 1
+            return None
+
+        parts = group[1]
+        if parts[number - 1] is not None:
+            self.counters["duplicates"] += 1
+        else:
+            group[2] += 1
+        parts[number - 1] = payload
+        if number == count:
+            # Only the last fragment's fill bits apply to the joined payload,
+            # whichever fragment happens to complete the group
+            group[3] = fill_bits
+
+        if group[2] < count:
+            return None
+
+        del self.groups[key]
+        self.counters["completed"] += 1
+        return "".join(parts), group[3]
+
+
+def decode_ais_stream(nmea_messages, reassembler=None, source="", duplicates=None, prefilter=None):
+    """Decode a sequence of AIVDM sentences, yielding one result per complete message.
+
+    Messages rejected by a HeaderFilter (`prefilter`) or already seen by a
+    DuplicateFilter (`duplicates`) are skipped before decoding.
+    """
+    reassembler = FragmentReassembler() if reassembler is None else reassembler
+    for nmea_message in nmea_messages:
+        try:
+            # The bare sentence, without any tag block, is what gets split
+            nmea_message = verify_sentence(nmea_message).decode("ascii")
+            message = reassembler.add(nmea_message, source)
+            if message is None:
+                continue
+            if prefilter is not None and not prefilter.accepts(
+                    message[0], nmea_message.split(',', 5)[4] if prefilter.needs_channel else None):
+                continue
+            if duplicates is None or not duplicates.is_duplicate(*message):
+                yield decode_ais_payload(*message)
+        except Exception as e:
+            yield f"Error decoding message: {e}"
+
+
+if __name__ == "__main__":
+    nmea_sentences = [
+        # Type 5 - Static and Voyage Related Data, split over two sentences
+        "!AIVDM,2,1,3,B,55P5TL01VIaAL@7WKO@mBplU@<PDhh000000001S;AJ::4A80?4i@E53,0*3E",
+        "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*3B",
+        "!AIVDM,2,2,3,B,1@0000000000000,2*55",
+
+        # Second half of a message whose first half was never received
+        "!AIVDM,2,2,7,A,00000000000,2*23",
+    ]
+
+    reassembler = FragmentReassembler()
+    for result in decode_ais_stream(nmea_sentences, reassembler):
+        print(result)
+    print(reassembler.counters)
@@ -0,0 +1,244 @@
+import argparse
+import heapq
+import math
+import random
+import socket
+import time
+
+from AIS.AIS_Encoder import encode_ais_message
+from GNSS.GNSS_Sender import MAX_DATAGRAM_BYTES, SERVER_IP, SERVER_PORT
+from NMEA.NMEA_Framing import nmea_checksum
+
+# Default traffic area: the approaches to Rotterdam
+DEFAULT_CENTER = (51.98, 3.95)
+DEFAULT_RADIUS_NM = 25.0
+
+# Static data (Type 5 / Type 24) is repeated every 6 minutes
+STATIC_INTERVAL = 360.0
+
+# Share of the fleet that is Class A (Type 1 + Type 5); the rest is Class B (Type 18 + Type 24)
+CLASS_A_SHARE = 0.7
+
+# (ship type code, typical speed in knots) for Class A and Class B vessels
+CLASS_A_KINDS = [(70, 14.0), (80, 13.0), (60, 18.0), (52, 9.0), (31, 10.0)]
+CLASS_B_KINDS = [(36, 6.0), (37, 18.0), (30, 8.0)]
+
+DESTINATIONS = ["ROTTERDAM", "ANTWERP", "HAMBURG", "FELIXSTOWE", "LE HAVRE", "IMMINGHAM", "BREMERHAVEN"]
+
+LINES_PER_WRITE = 10000
+
+
+def report_interval(sog, class_a):
+    """Seconds between position reports at a given speed (ITU-R M.1371)."""
+    if class_a:
+        if sog < 0.5:
+            return 180.0
+        if sog < 14.0:
+            return 10.0
+        return 6.0 if sog < 23.0 else 2.0
+    return 180.0 if sog < 2.0 else 30.0
+
+
+class TrafficSimulator:
+    """N vessels moving around a port area, emitting AIS sentences in time order.
+
+    Each vessel keeps its position report as a record dict that is updated in
+    place and handed straight to the encoder. Reports are scheduled on a heap
+    by simulated time at the rate AIS prescribes for the vessel's speed, so
+    output volume matches real traffic of the same size.
+    """
+
+    def __init__(self, vessels=1000, start=None, seed=0, center=DEFAULT_CENTER, radius_nm=DEFAULT_RADIUS_NM):
+        self.rng = rng = random.Random(seed)
+        self.center = center
+        self.radius_nm = radius_nm
+        self.now = time.time() if start is None else start
+        self.sequence_id = 0
+        self.positions = []
+        self.statics = []
+        self.cruise = []
+        self.updated = []
+        self.events = []  # heap of (time, vessel index, is static report)
+
+        for index in range(vessels):
+            class_a = rng.random() < CLASS_A_SHARE
+            ship_type, speed = rng.choice(CLASS_A_KINDS if class_a else CLASS_B_KINDS)
+            moored = rng.random() < 0.2
+            mmsi = 244000000 + index
+            bearing = rng.uniform(0.0, 2 * math.pi)
+            distance = radius_nm * math.sqrt(rng.random()) / 60.0
+            cog = rng.uniform(0.0, 360.0)
+            sog = 0.0 if moored else max(0.5, rng.gauss(speed, speed * 0.15))
+
+            self.positions.append({
+                "message_type": 1 if class_a else 18,
+                "mmsi": mmsi,
+                "latitude": center[0] + distance * math.cos(bearing),
+                "longitude": center[1] + distance * math.sin(bearing) / math.cos(math.radians(center[0])),
+                "speed_over_ground": sog,
+                "course_over_ground": cog,
+                "true_heading": int(cog) if class_a else 511,
+            })
+            name = f"SIM {index:05d}"
+            call_sign = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(6))
+            if class_a:
+                self.statics.append([{
+                    "message_type": 5, "mmsi": mmsi, "imo_number": 9000000 + index, "call_sign": call_sign,
+                    "ship_name": name, "ship_type": ship_type, "destination": rng.choice(DESTINATIONS),
+                }])
+            else:
+                self.statics.append([
+                    {"message_type": 24, "mmsi": mmsi, "part_number": 0, "vessel_name": name},
+                    {"message_type": 24, "mmsi": mmsi, "part_number": 1, "ship_type": ship_type,
+                     "vendor_id": "SIM", "callsign": call_sign},
+                ])
+            self.cruise.append(0.0 if moored else sog)
+            self.updated.append(self.now)
+
+            # Spread the first reports over one interval so the start is not a burst
+            heapq.heappush(self.events, (self.now + rng.uniform(0.0, report_interval(sog, class_a)), index, False))
+            heapq.heappush(self.events, (self.now + rng.uniform(0.0, STATIC_INTERVAL), index, True))
+
+    def _move(self, index, now):
+        record = self.positions[index]
+        dt = now - self.updated[index]
+        self.updated[index] = now
+        sog = record["speed_over_ground"]
+        if sog == 0.0 or dt <= 0.0:
+            return
+
+        lat = record["latitude"]
+        cog = record["course_over_ground"]
+        distance = sog * dt / 3600.0 / 60.0  # degrees of latitude
+        radians = math.radians(cog)
+        lat += distance * math.cos(radians)
+        lon = record["longitude"] + distance * math.sin(radians) / math.cos(math.radians(lat))
+
+        # Gentle course and speed changes; head back in when leaving the area
+        rng = self.rng
+        north = (self.center[0] - lat) * 60.0
+        east = (self.center[1] - lon) * 60.0 * math.cos(math.radians(lat))
+        if north * north + east * east > self.radius_nm * self.radius_nm:
+            cog = math.degrees(math.atan2(east, north)) + rng.uniform(-30.0, 30.0)
+        else:
+            cog += rng.uniform(-3.0, 3.0)
+        cog %= 360.0
+        cruise = self.cruise[index]
+        sog = min(max(sog + rng.uniform(-0.3, 0.3), cruise * 0.7), cruise * 1.3)
+
+        record["latitude"] = lat
+        record["longitude"] = lon
+        record["course_over_ground"] = cog
+        record["speed_over_ground"] = sog
+        if record["message_type"] == 1:
+            record["true_heading"] = int(cog)
+
+    def run(self, duration):
+        """Yield (unix time, sentence) for `duration` simulated seconds, in time order."""
+        end = self.now + duration
+        events = self.events
+        positions = self.positions
+        channels = "AB"
+        rng = self.rng
+        while events and events[0][0] < end:
+            now, index, static = heapq.heappop(events)
+            self.now = now
+            channel = channels[rng.getrandbits(1)]
+            if static:
+                for record in self.statics[index]:
+                    self.sequence_id = (self.sequence_id + 1) % 10
+                    for sentence in encode_ais_message(record, channel, self.sequence_id):
+                        yield now, sentence
+                heapq.heappush(events, (now + STATIC_INTERVAL, index, True))
+            else:
+                self._move(index, now)
+                record = positions[index]
+                yield now, encode_ais_message(record, channel)[0]
+                interval = report_interval(record["speed_over_ground"], record["message_type"] == 1)
+                heapq.heappush(events, (now + interval, index, False))
+        self.now = end
+
+
+def write_file(path, sentences, tag_blocks=True):
+    """Write (time, sentence) pairs to a log, with NMEA 4 \\c:time\\ tag blocks by default.
+
+    Returns the number of sentences written.
+    """
+    count = 0
+    lines = []
+    tag_second = None
+    tag = ""
+    with open(path, "w", buffering=1 << 20) as f:
+        for timestamp, sentence in sentences:
+            if tag_blocks:
+                second = int(timestamp)
+                if second != tag_second:
+                    tag_second = second
+                    tag = f"\\c:{second}*{nmea_checksum(f'c:{second}'):02X}\\"
+                lines.append(f"{tag}{sentence}\n")
+            else:
+                lines.append(f"{sentence}\n")
+            if len(lines) >= LINES_PER_WRITE:
+                f.writelines(lines)
+                count += len(lines)
+                lines.clear()
+        f.writelines(lines)
+        count += len(lines)
+    return count
+
+
+def send_udp(sentences, rate=None, host=SERVER_IP, port=SERVER_PORT, per_datagram=10):
+    """Stream (time, sentence) pairs to a UDP receiver at `rate` sentences/sec (None: as fast as possible).
+
+    Returns the number of sentences and datagrams sent.
+    """
+    address = (host, port)
+    count = datagrams = 0
+    pending = []
+    pending_bytes = 0
+    started = time.perf_counter()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sendto = sock.sendto
+        for _, sentence in sentences:
+            line = sentence.encode("ascii")
+            if pending and (len(pending) >= per_datagram or pending_bytes + len(line) + 1 > MAX_DATAGRAM_BYTES):
+                sendto(b"\n".join(pending), address)
+                datagrams += 1
+                pending.clear()
+                pending_bytes = 0
+                if rate is not None:
+                    delay = count / rate - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+            pending.append(line)
+            pending_bytes += len(line) + 1
+            count += 1
+        if pending:
+            sendto(b"\n".join(pending), address)
+            datagrams += 1
+    return {"sentences": count, "datagrams": datagrams}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic AIS traffic")
+    parser.add_argument("--vessels", type=int, default=1000)
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated time span")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=float, help="simulated start time (unix seconds); default now")
+    parser.add_argument("--output", help="write a log file instead of sending over UDP")
+    parser.add_argument("--no-tags", action="store_true", help="omit \\c: tag blocks in the log file")
+    parser.add_argument("--rate", type=float, help="UDP sentences/sec; omit for max rate")
+    parser.add_argument("--batch", type=int, default=10, help="sentences packed per datagram")
+    parser.add_argument("--host", default=SERVER_IP)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    simulator = TrafficSimulator(args.vessels, args.start, args.seed)
+    sentences = simulator.run(args.hours * 3600.0)
+    started = time.perf_counter()
+    if args.output:
+        count = write_file(args.output, sentences, not args.no_tags)
+    else:
+        count = send_udp(sentences, args.rate, args.host, args.port, args.batch)["sentences"]
+    elapsed = time.perf_counter() - started
+    print(f"Generated {count} sentences in {elapsed:.1f} s ({count / elapsed:,.0f} sentences/sec)")
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+from AIS.AIS_Fleet import POSITION_TYPES
+
+
+class StaticDataCache:
+    """Bounded LRU of per-MMSI static data used to enrich position reports.
+
+    Type 5 (static and voyage data) and Type 24 part A (name) / part B
+    (ship type, call sign) are merged into one entry per MMSI; the newest
+    value of each field wins. Once `max_vessels` is reached the least
+    recently seen vessel is evicted.
+    """
+
+    def __init__(self, max_vessels=100000):
+        self.max_vessels = max_vessels
+        self.entries = OrderedDict()  # mmsi -> {"vessel_name", "ship_type", "call_sign", ...}
+        self.counters = {"updates": 0, "hits": 0, "misses": 0, "evicted": 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _entry(self, mmsi):
+        entries = self.entries
+        entry = entries.get(mmsi)
+        if entry is None:
+            if len(entries) >= self.max_vessels:
+                entries.popitem(last=False)
+                self.counters["evicted"] += 1
+            entry = entries[mmsi] = {}
+        else:
+            entries.move_to_end(mmsi)
+        return entry
+
+    def update(self, record):
+        """Store the static fields of a decoded Type 5 or Type 24 message; returns False for anything else."""
+        if not isinstance(record, dict):
+            return False
+        message_type = record.get("message_type")
+
+        if message_type == 5:
+            self._entry(record["mmsi"]).update(
+                vessel_name=record["ship_name"],
+                ship_type=record["ship_type"],
+                call_sign=record["call_sign"],
+                imo_number=record["imo_number"],
+                destination=record["destination"],
+            )
+        elif message_type == 24:
+            entry = self._entry(record["mmsi"])
+            if record["part_number"] == 0:
+                entry["vessel_name"] = record["vessel_name"]
+            else:
+                entry["ship_type"] = record["ship_type"]
+                entry["call_sign"] = record["callsign"]
+        else:
+            return False
+
+        self.counters["updates"] += 1
+        return True
+
+    def get(self, mmsi):
+        entry = self.entries.get(mmsi)
+        if entry is not None:
+            self.entries.move_to_end(mmsi)
+        return entry
+
+    def enrich(self, record):
+        """Add vessel_name and ship_type (None if not yet known) to a position record in place."""
+        entry = self.entries.get(record["mmsi"])
+        if entry is None:
+            self.counters["misses"] += 1
+            record["vessel_name"] = None
+            record["ship_type"] = None
+        else:
+            self.counters["hits"] += 1
+            self.entries.move_to_end(record["mmsi"])
+            record["vessel_name"] = entry.get("vessel_name")
+            record["ship_type"] = entry.get("ship_type")
+        return record
+
+    def process(self, record):
+        """Cache static messages and enrich position reports; returns the record."""
+        if isinstance(record, dict):
+            if record.get("message_type") in POSITION_TYPES:
+                return self.enrich(record)
+            self.update(record)
+        return record
+
+
+if __name__ == "__main__":
+    from AIS.AIS_Reassembly import decode_ais_stream
+
+    nmea_sentences = [
+        # Type 1 position before anything is known about the vessel
+        "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*3B",
+        # Type 5 - Static and Voyage Related Data, split over two sentences
+        "!AIVDM,2,1,3,B,55P5TL01VIaAL@7WKO@mBplU@<PDhh000000001S;AJ::4A80?4i@E53,0*3E",
+        "!AIVDM,2,2,3,B,1@0000000000000,2*55",
+    ]
+
+    cache = StaticDataCache()
+    for record in decode_ais_stream(nmea_sentences):
+        print(cache.process(record))
+
+    # A later position from the same vessel picks up the cached name and type
+    print(cache.enrich({"message_type": 1, "mmsi": 369190000, "latitude": 47.6, "longitude": -122.3}))
+    print(cache.counters)
@@ -1,18 +1,100 @@
-from pyais import NMEAMessage
+import time
+
+from AIS.AIS_Manual import DECODERS, MESSAGE_SCHEMAS, SIXBIT_MAP, STATIC_DATA_PART_SCHEMAS, decode_ais_payload
+from NMEA.NMEA_Feed import parse_source
+from NMEA.NMEA_Framing import verify_sentence
+
+BACKENDS = ("pyais", "manual")
+
+# AIS_Manual field name -> pyais attribute, or alternatives tried in order when
+# the name differs between message classes. Fields pyais has no counterpart for
+# are left out of pyais records.
+PYAIS_ATTRIBUTES = {
+    "message_type": "msg_type",
+    "mmsi": "mmsi",
+    "longitude": "lon",
+    "latitude": "lat",
+    "speed_over_ground": "speed",
+    "course_over_ground": "course",
+    "true_heading": "heading",
+    "altitude": "alt",
+    "position_accuracy": "accuracy",
+    "raim_flag": "raim",
+    "gnss_position_status": "gnss",
+    "imo_number": "imo",
+    "call_sign": "callsign",
+    "callsign": "callsign",
+    "ship_name": "shipname",
+    "vessel_name": ("shipname", "name"),
+    "ship_type": "ship_type",
+    "destination": "destination",
+    "part_number": "partno",
+    "vendor_id": "vendorid",
+    "sequence_number": "seqno",
+    "destination_mmsi": "dest_mmsi",
+    "retransmit_flag": "retransmit",
+    "safety_text": "text",
+    "mmsi_1": "mmsi1",
+    "sequence_number_1": "mmsiseq1",
+    "mmsi_2": "mmsi2",
+    "sequence_number_2": "mmsiseq2",
+    "acknowledged_mmsi": "mmsi1",
+    "interrogated_mmsi": "mmsi1",
+    "assigned_mmsi_1": "mmsi1",
+}
+
+# AIS_Manual fields pyais splits up -> (pyais attributes needed, expression on `m` rebuilding the field)
+PYAIS_DERIVED = {
+    "utc_time": (("year", "month", "day", "hour", "minute", "second"),
+                 "f'{m.year}-{m.month:02d}-{m.day:02d} {m.hour:02d}:{m.minute:02d}:{m.second:02d}'"),
+    "application_id": (("dac", "fid"), "(m.dac << 6) | m.fid"),
+}
+
+# Types pyais decodes differently from AIS_Manual. decode_stream always hands
+# them to AIS_Manual, so both backends give the same records:
+#   5, 24  pyais maps reserved ship type codes to 0; 24 part B also splits the
+#          vendor id and rejects part numbers 2 and 3
+#   7      AIS_Manual reads the first acknowledged MMSI from bit 8
+#   9      pyais gives SOG in knots and no true heading
+#   14     pyais keeps a trailing partial character of the text
+#   17, 27 pyais positions are in minutes (17) and SOG/COG unscaled (27), at other offsets
+#   20     AIS_Manual reads a packed date, pyais the slot reservations
+#   21     pyais reads the name after the 5-bit aid type, at bit 43
+#   25, 26 pyais splits the payload by its addressed/structured flags
+MANUAL_ONLY_TYPES = frozenset({5, 7, 9, 14, 17, 20, 21, 24, 25, 26, 27})
+
+# Types the pyais backend decodes: everything else is left to AIS_Manual,
+# including types it has no decoder for
+PYAIS_TYPES = frozenset(DECODERS) - MANUAL_ONLY_TYPES
+
+# Message type -> payload bits needed to carry every field of its schema;
+# pyais gives None for fields past the end, so shorter messages go to AIS_Manual
+_FULL_BITS = {message_type: max(offset + width for _, offset, width, *_ in MESSAGE_SCHEMAS[message_type])
+              for message_type in PYAIS_TYPES}
+
+# First payload character -> message type
+_MESSAGE_TYPES = {ord(char): index for index, char in enumerate(SIXBIT_MAP)}
+
+# pyais message class -> function(message) returning its record
+_EXTRACTORS = {}
+
 
 def decode_ais_message(nmea_message):
     """Decode any AIS message type from NMEA format."""
     try:
-        # Parse the NMEA message using pyais
+        # Reject corrupt sentences before handing them to pyais
+        verify_sentence(nmea_message)
+
+        # Parse the NMEA message using pyais (imported here so importing this module stays cheap)
+        from pyais import NMEAMessage
         msg = NMEAMessage.from_string(nmea_message)
-        
+
         # Decode the message
         decoded_msg = msg.decode()
-        
+
         # Get the message type
         message_type = decoded_msg.msg_type
-        print(f"Message Type: {message_type}")
-        
+
         # Initialize the result dictionary
         result = {'message_type': message_type}
 
@@ -23,75 +105,267 @@ def decode_ais_message(nmea_message):
         if message_type in [1, 2, 3]:
             # Position Reports (Types 1, 2, 3)
             result.update({
-                'longitude': getattr(decoded_msg, 'longitude', 'N/A'),
-                'latitude': getattr(decoded_msg, 'latitude', 'N/A'),
-                'speed_over_ground': getattr(decoded_msg, 'sog', 'N/A'),
-                'course_over_ground': getattr(decoded_msg, 'cog', 'N/A'),
-                'true_heading': getattr(decoded_msg, 'true_heading', 'N/A'),
-                'navigational_status': getattr(decoded_msg, 'navigational_status', 'N/A')
+                'longitude': getattr(decoded_msg, 'lon', 'N/A'),
+                'latitude': getattr(decoded_msg, 'lat', 'N/A'),
+                'speed_over_ground': getattr(decoded_msg, 'speed', 'N/A'),
+                'course_over_ground': getattr(decoded_msg, 'course', 'N/A'),
+                'true_heading': getattr(decoded_msg, 'heading', 'N/A'),
+                'navigational_status': getattr(decoded_msg, 'status', 'N/A')
             })
         elif message_type == 4:
             # Base Station Report (Type 4)
             result.update({
-                'timestamp': getattr(decoded_msg, 'timestamp', 'N/A'),
-                'longitude': getattr(decoded_msg, 'longitude', 'N/A'),
-                'latitude': getattr(decoded_msg, 'latitude', 'N/A')
+                'timestamp': f"{decoded_msg.year}-{decoded_msg.month:02d}-{decoded_msg.day:02d} "
+                             f"{decoded_msg.hour:02d}:{decoded_msg.minute:02d}:{decoded_msg.second:02d}",
+                'longitude': getattr(decoded_msg, 'lon', 'N/A'),
+                'latitude': getattr(decoded_msg, 'lat', 'N/A')
             })
         elif message_type == 5:
             # Static and Voyage Related Data (Type 5)
             result.update({
-                'imo_number': getattr(decoded_msg, 'imo_number', 'N/A'),
-                'callsign': getattr(decoded_msg, 'call_sign', 'N/A').strip(),
-                'ship_name': getattr(decoded_msg, 'name', 'N/A').strip(),
-                'ship_type': getattr(decoded_msg, 'type_of_ship_and_cargo', 'N/A'),
-                'destination': getattr(decoded_msg, 'destination', 'N/A').strip(),
-                'eta': f"{getattr(decoded_msg, 'eta_month', 'N/A')}/{getattr(decoded_msg, 'eta_day', 'N/A')} {getattr(decoded_msg, 'eta_hour', 'N/A')}:{getattr(decoded_msg, 'eta_minute', 'N/A')}"
+                'imo_number': getattr(decoded_msg, 'imo', 'N/A'),
+                'callsign': (getattr(decoded_msg, 'callsign', None) or 'N/A').strip(),
+                'ship_name': (getattr(decoded_msg, 'shipname', None) or 'N/A').strip(),
+                'ship_type': getattr(decoded_msg, 'ship_type', 'N/A'),
+                'destination': (getattr(decoded_msg, 'destination', None) or 'N/A').strip(),
+                'eta': f"{getattr(decoded_msg, 'month', 'N/A')}/{getattr(decoded_msg, 'day', 'N/A')} {getattr(decoded_msg, 'hour', 'N/A')}:{getattr(decoded_msg, 'minute', 'N/A')}"
             })
         elif message_type == 6:
             # Addressed Binary Message (Type 6)
             result.update({
-                'sequence_number': getattr(decoded_msg, 'sequence_number', 'N/A'),
-                'destination_mmsi': getattr(decoded_msg, 'destination_mmsi', 'N/A'),
-                'retransmit_flag': getattr(decoded_msg, 'retransmit_flag', 'N/A'),
-                'binary_data': getattr(decoded_msg, 'binary_data', 'N/A')
+                'sequence_number': getattr(decoded_msg, 'seqno', 'N/A'),
+                'destination_mmsi': getattr(decoded_msg, 'dest_mmsi', 'N/A'),
+                'retransmit_flag': getattr(decoded_msg, 'retransmit', 'N/A'),
+                'binary_data': getattr(decoded_msg, 'data', 'N/A')
             })
         # Add more message types handling as needed
         elif message_type == 24:
-            # Static Data Report (Type 24)
+            # Static Data Report (Type 24); part A carries the name, part B the rest
             result.update({
-                'part_number': getattr(decoded_msg, 'part_number', 'N/A'),
-                'ship_name': getattr(decoded_msg, 'name', 'N/A').strip(),
-                'callsign': getattr(decoded_msg, 'call_sign', 'N/A').strip(),
-                'ship_type': getattr(decoded_msg, 'type_of_ship_and_cargo', 'N/A'),
-                'dimension_to_bow': getattr(decoded_msg, 'dimension_to_bow', 'N/A'),
-                'dimension_to_stern': getattr(decoded_msg, 'dimension_to_stern', 'N/A'),
-                'dimension_to_port': getattr(decoded_msg, 'dimension_to_port', 'N/A'),
-                'dimension_to_starboard': getattr(decoded_msg, 'dimension_to_starboard', 'N/A')
+                'part_number': getattr(decoded_msg, 'partno', 'N/A'),
+                'ship_name': (getattr(decoded_msg, 'shipname', None) or 'N/A').strip(),
+                'callsign': (getattr(decoded_msg, 'callsign', None) or 'N/A').strip(),
+                'ship_type': getattr(decoded_msg, 'ship_type', 'N/A'),
+                'dimension_to_bow': getattr(decoded_msg, 'to_bow', 'N/A'),
+                'dimension_to_stern': getattr(decoded_msg, 'to_stern', 'N/A'),
+                'dimension_to_port': getattr(decoded_msg, 'to_port', 'N/A'),
+                'dimension_to_starboard': getattr(decoded_msg, 'to_starboard', 'N/A')
             })
         else:
             # Handle unsupported or unimplemented message types
             result['data'] = f"Decoding for message type {message_type} is not specifically handled."
-        
+
         return result
-    
-    except AttributeError as e:
-        print(f"An error occurred while decoding: {e}")
-        return None
+
     except Exception as e:
-        print(f"An error occurred while decoding: {e}")
+        return f"Error decoding message: {e}"
+
+
+def _is_coded(field):
+    """Whether pyais decodes this field to a bool flag or an IntEnum code rather than a plain value."""
+    converter = field.metadata.get("from_converter")
+    return field.metadata.get("d_type") is bool or isinstance(getattr(converter, "__self__", None), type)
+
+
+def _pyais_expression(available, name, scale):
+    """Expression on `m` giving AIS_Manual's value of one field, or None if pyais has no counterpart.
+
+    `available` maps the pyais message class's attribute names to their
+    dataclass fields. A field pyais left as None (past the end of a short
+    payload) stays None.
+    """
+    derived = PYAIS_DERIVED.get(name)
+    if derived is not None:
+        attributes, expression = derived
+        if not available.keys() >= set(attributes):
+            return None
+        # The last attribute is the first to run off the end of a short payload
+        return f"None if m.{attributes[-1]} is None else {expression}"
+
+    candidates = PYAIS_ATTRIBUTES.get(name, ())
+    for attribute in (candidates,) if isinstance(candidates, str) else candidates:
+        if attribute in available:
+            break
+    else:
         return None
+    if scale is not None:
+        # pyais rounds scaled values (lat/lon to 6 decimals); back to the raw count and rescale
+        return f"None if m.{attribute} is None else round(m.{attribute} * {scale!r}) / {scale!r}"
+    if _is_coded(available[attribute]):
+        return f"None if m.{attribute} is None else int(m.{attribute})"
+    return f"m.{attribute}"
+
+
+def _compile_extractor(message):
+    """Compile a function turning a decoded pyais message of this class into an AIS_Manual record."""
+    available = {field.name: field for field in type(message).fields()}
+    if message.msg_type == 24:
+        fields = STATIC_DATA_PART_SCHEMAS[0 if message.partno == 0 else 1]
+    else:
+        fields = MESSAGE_SCHEMAS.get(message.msg_type) or [("message_type",), ("mmsi",)]
+    items = []
+    for name, *field in fields:
+        expression = _pyais_expression(available, name, field[3] if field else None)
+        if expression is not None:
+            items.append(f"    {name!r}: {expression},")
+
+    name = f"pyais_{type(message).__name__}"
+    source = "\n".join([f"def {name}(m):", "    return {", *items, "    }"])
+    namespace = {}
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    extractor = _EXTRACTORS[type(message)] = namespace[name]
+    return extractor
+
+
+def pyais_record(message):
+    """A decoded pyais message as a dict with AIS_Manual's field names, in the same order.
+
+    For PYAIS_TYPES the record equals AIS_Manual's; check_parity() compares them.
+    """
+    extractor = _EXTRACTORS.get(type(message))
+    if extractor is None:
+        extractor = _compile_extractor(message)
+    return extractor(message)
+
+
+def open_stream(source):
+    """pyais stream reader for "udp:PORT", "udp:HOST:PORT", "tcp:HOST:PORT" or a file path."""
+    from pyais.stream import FileReaderStream, TCPConnection, UDPReceiver
+
+    if source.startswith("tcp:"):
+        host, _, port = source[4:].rpartition(":")
+        return TCPConnection(host or "127.0.0.1", int(port))
+    kind, address = parse_source(source)
+    return UDPReceiver(*address) if kind == "udp" else FileReaderStream(address)
+
+
+def _manual_types(backend, per_type):
+    if backend not in BACKENDS or any(choice not in BACKENDS for choice in (per_type or {}).values()):
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    per_type = per_type or {}
+    return frozenset(t for t in range(64) if t not in PYAIS_TYPES or per_type.get(t, backend) == "manual")
+
+
+def decode_stream(stream, backend="pyais", per_type=None, counters=None):
+    """Decode every message of a pyais stream reader, yielding one record per message.
+
+    pyais reads and reassembles the sentences. Each message is then decoded
+    by `backend` ("pyais" or "manual"), or by the backend `per_type` names
+    for its message type, e.g. the result of fastest_backends(). Both give
+    records keyed like the AIS_Manual decoders; payloads too short to carry
+    every field always go to AIS_Manual. Messages with a bad
+    checksum are skipped and, if a `counters` dict is given, counted under
+    "rejected"; a message that fails to decode yields an error string.
+    """
+    manual_types = _manual_types(backend, per_type)
+    message_types = _MESSAGE_TYPES
+    full_bits = _FULL_BITS
+    extractors = _EXTRACTORS
+    for message in stream:
+        if not message.is_valid:
+            if counters is not None:
+                counters["rejected"] = counters.get("rejected", 0) + 1
+            continue
+        try:
+            payload = message.payload
+            message_type = message_types.get(payload[0])
+            if (message_type in manual_types
+                    or len(payload) * 6 - message.fill_bits < full_bits.get(message_type, 0)):
+                yield decode_ais_payload(payload.decode("ascii"), message.fill_bits)
+            else:
+                decoded = message.decode()
+                extractor = extractors.get(type(decoded))
+                yield (_compile_extractor(decoded) if extractor is None else extractor)(decoded)
+        except Exception as e:
+            yield f"Error decoding message: {e}"
+
+
+def fastest_backends(sentences, repeat=3):
+    """Time both backends on a sample of sentences and return {message type: fastest backend}."""
+    from pyais.stream import IterMessages
+
+    by_type = {}
+    for message in IterMessages(sentence.encode("ascii") if isinstance(sentence, str) else sentence
+                                for sentence in sentences):
+        if message.is_valid and message.payload:
+            by_type.setdefault(_MESSAGE_TYPES.get(message.payload[0]), []).append(message)
+
+    # Other types are decoded by AIS_Manual whichever backend is asked for
+    fastest = {message_type: "manual" for message_type in by_type if message_type not in PYAIS_TYPES}
+    for message_type, messages in sorted(by_type.items()):
+        if message_type not in PYAIS_TYPES:
+            continue
+        timings = {}
+        for backend in BACKENDS:
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(decode_stream(messages, backend))
+                best = min(best, time.perf_counter() - started)
+            timings[backend] = best
+        fastest[message_type] = min(timings, key=timings.get)
+    return fastest
+
+
+def _same_record(first, second):
+    # == alone would let True match 1 and 1.0 match 1
+    return first == second and all(type(value) is type(second[name]) for name, value in first.items())
+
+
+def check_parity(sentences):
+    """Decode sentences with both backends and return the messages whose records differ.
+
+    Only PYAIS_TYPES messages long enough to carry every field are compared,
+    since the others are decoded by AIS_Manual either way. Each difference is (message type, AIS_Manual record, pyais
+    record); a decode that fails gives its error string as the record.
+    """
+    from pyais.stream import IterMessages
+
+    differences = []
+    for message in IterMessages(sentence.encode("ascii") if isinstance(sentence, str) else sentence
+                                for sentence in sentences):
+        if not (message.is_valid and message.payload):
+            continue
+        message_type = _MESSAGE_TYPES.get(message.payload[0])
+        if (message_type not in PYAIS_TYPES
+                or len(message.payload) * 6 - message.fill_bits < _FULL_BITS[message_type]):
+            continue
+        records = []
+        for decode in (lambda: decode_ais_payload(message.payload.decode("ascii"), message.fill_bits),
+                       lambda: pyais_record(message.decode())):
+            try:
+                records.append(decode())
+            except Exception as e:
+                records.append(f"Error decoding message: {e}")
+        manual, pyais = records
+        if isinstance(manual, dict) and isinstance(pyais, dict):
+            same = _same_record(manual, pyais)
+        else:
+            same = manual == pyais
+        if not same:
+            differences.append((message_type, manual, pyais))
+    return differences
 
 
 # Example NMEA messages for testing
 nmea_messages = [
-    "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*6C",  # Type 1, 2, or 3 Position Report
-    "!AIVDM,1,1,,B,402P?v1vS13j@<:O<UQEqgvN0000,0*1F",  # Type 4 Base Station Report
-    "!AIVDM,2,1,1,B,55P:v`02>t@DN1K7G6C4QDpU0TKH0000000000000,0*3B",  # Type 5 Static and Voyage Data
-    "!AIVDM,1,1,,A,64:Ijv00000H1K3o2Tf:a000,0*5C",  # Type 6 Binary Message
-    "!AIVDM,1,1,,B,24NjQa000001wvRD5Q??Uww2:RO,0*51",  # Type 24 Static Data Report
+    "!AIVDM,1,1,,B,15Mv`;P00R8GpFP<JLPT3?wP0D00,0*3B",  # Type 1, 2, or 3 Position Report
+    "!AIVDM,1,1,,B,402P?v1vS13j@<:O<UQEqgvN0000,0*2C",  # Type 4 Base Station Report
+    "!AIVDM,2,1,1,B,55P:v`02>t@DN1K7G6C4QDpU0TKH0000000000000,0*45",  # Type 5 Static and Voyage Data
+    "!AIVDM,1,1,,A,64:Ijv00000H1K3o2Tf:a000,0*7E",  # Type 6 Binary Message
+    "!AIVDM,1,1,,B,24NjQa000001wvRD5Q??Uww2:RO,0*05",  # Type 24 Static Data Report
 ]
 
-# Decode and print output for each message
-for nmea in nmea_messages:
-    result = decode_ais_message(nmea)
-    print(result)
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # SOURCE [pyais|manual]: stream-decode a file, UDP port or TCP feed
+        for record in decode_stream(open_stream(sys.argv[1]), *sys.argv[2:3]):
+            print(record)
+    else:
+        # Decode and print output for each message
+        for nmea in nmea_messages:
+            result = decode_ais_message(nmea)
+            print(result)
+        print(f"Backends differ on {len(check_parity(nmea_messages))} of the messages both decode")
@@ -1,105 +1,344 @@
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import messagebox
-
-def nmea_to_binary(payload):
-    # AIS encoding table, each character is mapped to its 6-bit binary representation
-    six_bit_ascii = {
-        '0': 0, '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7,
-        '8': 8, '9': 9, ':': 10, ';': 11, '<': 12, '=': 13, '>': 14, '?': 15,
-        '@': 16, 'A': 17, 'B': 18, 'C': 19, 'D': 20, 'E': 21, 'F': 22, 'G': 23,
-        'H': 24, 'I': 25, 'J': 26, 'K': 27, 'L': 28, 'M': 29, 'N': 30, 'O': 31,
-        'P': 32, 'Q': 33, 'R': 34, 'S': 35, 'T': 36, 'U': 37, 'V': 38, 'W': 39,
-        '`': 40, 'a': 41, 'b': 42, 'c': 43, 'd': 44, 'e': 45, 'f': 46, 'g': 47,
-        'h': 48, 'i': 49, 'j': 50, 'k': 51, 'l': 52, 'm': 53, 'n': 54, 'o': 55,
-        'p': 56, 'q': 57, 'r': 58, 's': 59, 't': 60, 'u': 61, 'v': 62, 'w': 63
-    }
-
-    binary_str = ''
-    for char in payload:
-        value = six_bit_ascii[char]
-        binary_str += f'{value:06b}'  # Convert to 6-bit binary
-
-    return binary_str
-
-def decode_ais_position_report(binary_str):
-    # Extracting fields based on AIS message type 1, 2, or 3 (position reports)
-    message_type = int(binary_str[0:6], 2)
-    repeat_indicator = int(binary_str[6:8], 2)
-    mmsi = int(binary_str[8:38], 2)
-    navigational_status = int(binary_str[38:42], 2)
-    rate_of_turn = int(binary_str[42:50], 2)
-    speed_over_ground = int(binary_str[50:60], 2) / 10
-    position_accuracy = int(binary_str[60:61], 2)
-
-    longitude = int(binary_str[61:89], 2)
-    latitude = int(binary_str[89:116], 2)
-     # Longitude is encoded in the range -180 to 180 degrees
-    if longitude & (1 << 27):  # Check if the sign bit (bit 27) is set
-        longitude -= (1 << 28)  # Adjust for negative values
-    longitude = longitude / 600000  # Convert from 1/600000 degree to degrees
-    
-    # Latitude is encoded in the range -90 to 90 degrees
-    if latitude & (1 << 26):  # Check if the sign bit (bit 26) is set
-        latitude -= (1 << 27)  # Adjust for negative values
-    latitude = latitude / 600000  # Convert from 1/600000 degree to degrees
-
-    course_over_ground = int(binary_str[116:128], 2) / 10
-    true_heading = int(binary_str[128:137], 2)
-    timestamp = int(binary_str[137:143], 2)
-
-    # Return a dictionary of decoded fields
-    return {
-        'message_type': message_type,
-        'repeat_indicator': repeat_indicator,
-        'mmsi': mmsi,
-        'navigational_status': navigational_status,
-        'rate_of_turn': rate_of_turn,
-        'speed_over_ground': speed_over_ground,
-        'position_accuracy': position_accuracy,
-        'longitude': longitude,
-        'latitude': latitude,
-        'course_over_ground': course_over_ground,
-        'true_heading': true_heading,
-        'timestamp': timestamp
-    }
+from tkinter import filedialog, messagebox, ttk
+
+from AIS.AIS_Manual import decode_ais_payload
+from NMEA.NMEA_Feed import FeedReader
+from NMEA.NMEA_Framing import verify_sentence
+from NMEA.NMEA_Index import LogIndex
+
+# Live mode: the feed is drained every LIVE_REFRESH_MS, at most LIVE_BATCH_SIZE
+# records at a time, and only the last MAX_SCROLLBACK_LINES lines are kept
+LIVE_REFRESH_MS = 100
+LIVE_BATCH_SIZE = 2000
+MAX_SCROLLBACK_LINES = 5000
+
+# Bulk view: Treeview items that exist at any time (one page), and its columns as
+# (id, heading, width, LogIndex column to sort by; None is file order)
+PAGE_ROWS = 40
+TABLE_COLUMNS = [
+    ("row", "Row", 80, None),
+    ("type", "Type", 60, "message_type"),
+    ("mmsi", "MMSI", 100, "mmsi"),
+    ("latitude", "Latitude", 100, "latitude"),
+    ("longitude", "Longitude", 100, "longitude"),
+    ("sog", "SOG", 60, "speed_over_ground"),
+    ("cog", "COG", 60, "course_over_ground"),
+    ("heading", "Heading", 60, "true_heading"),
+]
+
 
 def decode_nmea():
     nmea_message = nmea_entry.get()
 
     try:
-        # Extracting the payload from the NMEA message
-        payload = nmea_message.split(',')[5]
-        
-        # Convert payload to binary
-        binary_payload = nmea_to_binary(payload)
+        # Reject corrupt sentences before decoding
+        nmea_message = verify_sentence(nmea_message).decode("ascii")
 
-        # Decode the binary AIS message
-        decoded_message = decode_ais_position_report(binary_payload)
+        # Extracting the payload and fill bits from the NMEA message
+        fields = nmea_message.split(',')
+        payload, fill_bits = fields[5], int(fields[6][0])
 
-        # Display the decoded message
+        # Decode the AIS message with AIS_Manual's compiled decoders
+        decoded_message = decode_ais_payload(payload, fill_bits)
+
+        # Display the decoded message (a string for types AIS_Manual does not handle)
         result_text.delete(1.0, tk.END)
-        for key, value in decoded_message.items():
-            result_text.insert(tk.END, f'{key}: {value}\n')
+        if isinstance(decoded_message, dict):
+            for key, value in decoded_message.items():
+                result_text.insert(tk.END, f'{key}: {value}\n')
+        else:
+            result_text.insert(tk.END, f'{decoded_message}\n')
 
     except Exception as e:
         messagebox.showerror("Error", f"Failed to decode NMEA message: {e}")
 
-# Create the main window
-root = tk.Tk()
-root.title("AIS Decoder")
+live_reader = None
+live_stats = {"since": 0.0, "received": 0}
+
+
+def start_live():
+    global live_reader
+    stop_live()
+    try:
+        live_reader = FeedReader(source_entry.get().strip())
+    except ValueError as e:
+        messagebox.showerror("Error", f"Bad feed source: {e}")
+        return
+    live_reader.start()
+    live_stats.update(since=time.monotonic(), received=0)
+    status_text.set(f"Live: {source_entry.get().strip()}")
+    root.after(LIVE_REFRESH_MS, drain_live, live_reader)
+
+
+def stop_live():
+    global live_reader
+    if live_reader is not None:
+        # Waits (at most a poll interval) for the reader to release its port or file
+        live_reader.stop()
+        live_reader = None
+        status_text.set("Stopped")
+
+
+def drain_live(reader):
+    # A newer feed (or none) replaced this one; let this refresh loop end
+    if reader is not live_reader:
+        return
+    if reader.error is not None:
+        stop_live()
+        status_text.set(f"Feed failed: {reader.error}")
+        messagebox.showerror("Error", f"Live feed failed: {reader.error}")
+        return
+
+    lines = []
+    get = reader.records.get_nowait
+    try:
+        while len(lines) < LIVE_BATCH_SIZE:
+            kind, record = get()
+            lines.append(f"{kind}: {record}\n")
+    except queue.Empty:
+        pass
+
+    if lines:
+        # One insert per refresh; keep following the feed only if already at the bottom
+        following = live_text.yview()[1] >= 1.0
+        live_text.insert(tk.END, "".join(lines))
+        excess = int(live_text.index("end-1c").split(".")[0]) - MAX_SCROLLBACK_LINES
+        if excess > 0:
+            live_text.delete("1.0", f"{excess + 1}.0")
+        if following:
+            live_text.see(tk.END)
+
+    now = time.monotonic()
+    elapsed = now - live_stats["since"]
+    if elapsed >= 1.0:
+        received = reader.counters["received"]
+        rate = (received - live_stats["received"]) / elapsed
+        status_text.set(f"{rate:,.0f} msgs/sec | {received:,} received | "
+                        f"{reader.counters['dropped']:,} dropped | {reader.records.qsize():,} queued")
+        live_stats.update(since=now, received=received)
+
+    root.after(LIVE_REFRESH_MS, drain_live, reader)
+
+
+class LogViewer:
+    """Window listing every message of a log file.
+
+    The file is decoded into a LogIndex on a worker thread. The table is
+    virtual: only one page of rows exists as Treeview items, rebuilt from the
+    index columns whenever the view scrolls, so a million-line capture costs
+    no more to show than a short one. Sorting and filtering return new row
+    orders from the index without decoding again.
+    """
+
+    def __init__(self, master, path):
+        self.index = LogIndex(path)
+        self.rows = []
+        self.first = 0
+        self.sort_by = None
+        self.descending = False
+        self.filters = {}
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"AIS Log - {path}")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        filter_frame = tk.Frame(self.window)
+        filter_frame.pack(fill=tk.X)
+        tk.Label(filter_frame, text="MMSI:").pack(side=tk.LEFT)
+        self.mmsi_entry = tk.Entry(filter_frame, width=12)
+        self.mmsi_entry.pack(side=tk.LEFT)
+        tk.Label(filter_frame, text="Type:").pack(side=tk.LEFT)
+        self.type_entry = tk.Entry(filter_frame, width=4)
+        self.type_entry.pack(side=tk.LEFT)
+        tk.Button(filter_frame, text="Filter", command=self.apply_filter).pack(side=tk.LEFT)
+        tk.Button(filter_frame, text="Clear", command=self.clear_filter).pack(side=tk.LEFT)
+        tk.Button(filter_frame, text="Next page", command=lambda: self.show(self.first + PAGE_ROWS)).pack(side=tk.RIGHT)
+        tk.Button(filter_frame, text="Previous page", command=lambda: self.show(self.first - PAGE_ROWS)).pack(side=tk.RIGHT)
+
+        self.status = tk.StringVar(value="Decoding...")
+        tk.Label(self.window, textvariable=self.status, anchor=tk.W, relief=tk.SUNKEN).pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.detail_text = tk.Text(self.window, height=8, width=100)
+        self.detail_text.pack(side=tk.BOTTOM, fill=tk.X)
+
+        table_frame = tk.Frame(self.window)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(table_frame, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in TABLE_COLUMNS], show="headings",
+                                 height=PAGE_ROWS, selectmode="browse")
+        for column, heading, width, sort_by in TABLE_COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda sort_by=sort_by: self.sort(sort_by))
+            self.tree.column(column, width=width, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self.show_detail)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.wheel)
+
+        self.error = None
+        self.stopped = threading.Event()
+        threading.Thread(target=self.build, daemon=True).start()
+        self.window.after(200, self.poll_build)
+
+    def build(self):
+        # Runs on the worker thread; the Tk side only polls progress and error
+        try:
+            self.index.build(self.stopped)
+        except Exception as e:
+            self.error = e
+
+    def poll_build(self):
+        if self.stopped.is_set():
+            return
+        if self.error is not None:
+            self.status.set(f"Failed to read log: {self.error}")
+            return
+        if self.index.progress < 1.0:
+            self.status.set(f"Decoding... {self.index.progress:.0%}")
+            self.window.after(200, self.poll_build)
+            return
+        self.refresh()
+
+    def refresh(self):
+        self.rows = self.index.view(sort_by=self.sort_by, descending=self.descending, **self.filters)
+        self.show(0)
+
+    def show(self, first):
+        """Materialize the page of rows starting at view position `first`."""
+        total = len(self.rows)
+        self.first = first = max(0, min(first, total - PAGE_ROWS))
+        self.tree.delete(*self.tree.get_children())
+        summary = self.index.summary
+        for row in self.rows[first:first + PAGE_ROWS]:
+            self.tree.insert("", tk.END, iid=str(row), values=summary(row))
+
+        if total:
+            self.scrollbar.set(first / total, min(1.0, (first + PAGE_ROWS) / total))
+            self.status.set(f"{first + 1:,}-{min(total, first + PAGE_ROWS):,} of {total:,} messages "
+                            f"({self.index.rows:,} in file)")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.status.set(f"No matching messages ({self.index.rows:,} in file)")
+
+    def scroll(self, action, amount, unit=None):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units" | "pages")
+        if action == "moveto":
+            self.show(int(float(amount) * len(self.rows)))
+        else:
+            self.show(self.first + int(amount) * (PAGE_ROWS if unit == "pages" else 1))
+
+    def wheel(self, event):
+        step = -3 if event.num == 4 or getattr(event, "delta", 0) > 0 else 3
+        self.show(self.first + step)
+        return "break"
+
+    def sort(self, sort_by):
+        # A second click on the same heading reverses the order
+        self.descending = not self.descending if sort_by == self.sort_by else False
+        self.sort_by = sort_by
+        self.refresh()
+
+    def apply_filter(self):
+        try:
+            mmsi = self.mmsi_entry.get().strip()
+            message_type = self.type_entry.get().strip()
+            self.filters = {"mmsi": int(mmsi) if mmsi else None,
+                            "message_type": int(message_type) if message_type else None}
+        except ValueError:
+            messagebox.showerror("Error", "MMSI and type must be numbers", parent=self.window)
+            return
+        self.refresh()
+
+    def clear_filter(self):
+        self.mmsi_entry.delete(0, tk.END)
+        self.type_entry.delete(0, tk.END)
+        self.filters = {}
+        self.refresh()
+
+    def show_detail(self, event):
+        # Only the selected message is decoded in full
+        selection = self.tree.selection()
+        if not selection:
+            return
+        record = self.index.record(int(selection[0]))
+        self.detail_text.delete(1.0, tk.END)
+        if isinstance(record, dict):
+            for key, value in record.items():
+                self.detail_text.insert(tk.END, f'{key}: {value}\n')
+        else:
+            self.detail_text.insert(tk.END, f'{record}\n')
+
+    def close(self):
+        self.stopped.set()
+        self.window.destroy()
+
+
+def open_log():
+    path = filedialog.askopenfilename(title="Open NMEA log")
+    if path:
+        LogViewer(root, path)
+
+
+def main():
+    """Build the main window and run the Tk event loop."""
+    # The callbacks above find the widgets as module globals
+    global root, nmea_entry, result_text, source_entry, status_text, live_text
+
+    # Create the main window
+    root = tk.Tk()
+    root.title("AIS Decoder")
+
+    # Create input fields and buttons
+    nmea_label = tk.Label(root, text="Enter NMEA Message:")
+    nmea_label.pack()
+
+    nmea_entry = tk.Entry(root, width=50)
+    nmea_entry.pack()
+
+    decode_button = tk.Button(root, text="Decode", command=decode_nmea)
+    decode_button.pack()
+
+    open_button = tk.Button(root, text="Open log file...", command=open_log)
+    open_button.pack()
+
+    result_text = tk.Text(root, height=15, width=60)
+    result_text.pack()
+
+    # Live feed: "udp:PORT" or the path of a log file to follow
+    live_frame = tk.Frame(root)
+    live_frame.pack(fill=tk.X)
+
+    source_label = tk.Label(live_frame, text="Live feed (udp:PORT or file):")
+    source_label.pack(side=tk.LEFT)
+
+    source_entry = tk.Entry(live_frame, width=30)
+    source_entry.insert(0, "udp:12345")
+    source_entry.pack(side=tk.LEFT)
+
+    start_button = tk.Button(live_frame, text="Start", command=start_live)
+    start_button.pack(side=tk.LEFT)
+
+    stop_button = tk.Button(live_frame, text="Stop", command=stop_live)
+    stop_button.pack(side=tk.LEFT)
+
+    # Packed before the feed text so it keeps its place when the window shrinks
+    status_text = tk.StringVar(value="Idle")
+    status_bar = tk.Label(root, textvariable=status_text, anchor=tk.W, relief=tk.SUNKEN)
+    status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
-# Create input fields and buttons
-nmea_label = tk.Label(root, text="Enter NMEA Message:")
-nmea_label.pack()
+    live_scrollbar = tk.Scrollbar(root)
+    live_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-nmea_entry = tk.Entry(root, width=50)
-nmea_entry.pack()
+    live_text = tk.Text(root, height=20, width=100, yscrollcommand=live_scrollbar.set)
+    live_text.pack(fill=tk.BOTH, expand=True)
+    live_scrollbar.config(command=live_text.yview)
 
-decode_button = tk.Button(root, text="Decode", command=decode_nmea)
-decode_button.pack()
+    # Run the main loop
+    root.mainloop()
 
-result_text = tk.Text(root, height=15, width=60)
-result_text.pack()
 
-# Run the main loop
-root.mainloop()
+if __name__ == "__main__":
+    main()
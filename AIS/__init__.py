@@ -0,0 +1 @@
+"""AIS decoders, encoder, reassembly and related tools."""
@@ -1,56 +1,95 @@
-def parse_ginav_sentence(sentence):
-    if not sentence.startswith("$GINAV"):
-        raise ValueError("Not a GINAV NMEA sentence")
-    
+from collections import namedtuple
+
+from NMEA.NMEA_Framing import frame_sentence, verify_sentence
+
+# Parsed $GINAV sentence. latitude/longitude are signed decimal degrees, altitude
+# and geoidal separation are in metres; missing values are None.
+GINAVRecord = namedtuple("GINAVRecord", [
+    "fix_quality", "year", "latitude", "longitude", "num_satellites", "hdop", "altitude", "geoidal_separation",
+])
+
+
+def _int(value):
+    return int(value) if value else None
+
+
+def _float(value):
+    return float(value) if value else None
+
+
+def _signed_degrees(value, direction):
+    # GINAV already carries decimal degrees; the hemisphere letter gives the sign
+    if not value:
+        return None
+    return -float(value) if direction in ('S', 'W') else float(value)
+
+
+def _parse_fields(sentence):
     # Remove the prefix and the checksum
     data_part = sentence[7:sentence.find('*')]  # Exclude '$GINAV,' and before '*'
-    checksum_provided = sentence.split('*')[1].strip()  # Extract checksum part
-
-    # Calculate checksum
-    checksum_calculated = 0
-    for char in data_part:
-        checksum_calculated ^= ord(char)
-    
-    # Convert checksum to hexadecimal
-    checksum_calculated_hex = format(checksum_calculated, '02X')
-    
+
     # Split the sentence into fields
     fields = data_part.split(',')
-    
+
     # Check if fields length matches expected length
     if len(fields) < 12:
         raise ValueError("Incomplete GINAV sentence")
-    
-    # Extract fields
-    fix_quality = fields[0]
-    year = fields[1]
-    latitude = fields[2]
-    lat_direction = fields[3]
-    longitude = fields[4]
-    lon_direction = fields[5]
-    num_satellites = fields[6]
-    hdop = fields[7]
-    altitude = fields[8]
-    altitude_units = fields[9]
-    geoidal_separation = fields[10]
-    geoidal_units = fields[11]
-    
-    # Print extracted data
-    print(f"Fix Quality: {fix_quality}")
-    print(f"Year: {year}")
-    print(f"Latitude: {latitude} {lat_direction}")
-    print(f"Longitude: {longitude} {lon_direction}")
-    print(f"Number of Satellites: {num_satellites}")
-    print(f"Horizontal Dilution of Precision (HDOP): {hdop}")
-    print(f"Altitude: {altitude} {altitude_units}")
-    print(f"Geoidal Separation: {geoidal_separation} {geoidal_units}")
-    
-    # Validate checksum
-    if checksum_provided == checksum_calculated_hex:
-        print("Checksum validation passed.")
-    else:
-        print(f"Checksum validation failed. Calculated: {checksum_calculated_hex}, Provided: {checksum_provided}")
 
-# Example sentence
-nmea_sentence = "$GINAV,1,2024,19.0760,N,72.8777,E,15,1.0,7.5,M,-34.0,M,,*7C\r\n"
-parse_ginav_sentence(nmea_sentence)
+    return GINAVRecord(
+        fix_quality=_int(fields[0]),
+        year=_int(fields[1]),
+        latitude=_signed_degrees(fields[2], fields[3]),
+        longitude=_signed_degrees(fields[4], fields[5]),
+        num_satellites=_int(fields[6]),
+        hdop=_float(fields[7]),
+        altitude=_float(fields[8]),
+        geoidal_separation=_float(fields[10]),
+    )
+
+
+def parse_ginav_sentence(sentence):
+    if not sentence.startswith("$GINAV"):
+        raise ValueError("Not a GINAV NMEA sentence")
+
+    # Reject corrupt sentences before touching any fields; the checksum
+    # covers everything between '$' and '*', including the 'GINAV,' header
+    verify_sentence(sentence)
+
+    return _parse_fields(sentence)
+
+
+def parse_ginav_sentences(sentences):
+    """Parse a list of GINAV sentences; entries that are corrupt or not GINAV become None."""
+    records = []
+    for sentence in sentences:
+        framed = frame_sentence(sentence)
+        if framed is None or not framed.startswith(b"$GINAV"):
+            records.append(None)
+            continue
+        try:
+            records.append(_parse_fields(framed.decode('ascii')))
+        except ValueError:
+            records.append(None)
+    return records
+
+
+def print_ginav(record):
+    """Print a parsed GINAV record field by field."""
+    print(f"Fix Quality: {record.fix_quality}")
+    print(f"Year: {record.year}")
+    print(f"Latitude: {record.latitude}")
+    print(f"Longitude: {record.longitude}")
+    print(f"Number of Satellites: {record.num_satellites}")
+    print(f"Horizontal Dilution of Precision (HDOP): {record.hdop}")
+    print(f"Altitude: {record.altitude} M")
+    print(f"Geoidal Separation: {record.geoidal_separation} M")
+
+
+if __name__ == "__main__":
+    # Example sentence
+    nmea_sentence = "$GINAV,1,2024,19.0760,N,72.8777,E,15,1.0,7.5,M,-34.0,M,,*59\r\n"
+    try:
+        print_ginav(parse_ginav_sentence(nmea_sentence))
+        print("Checksum validation passed.")
+    except ValueError as e:
+        print(e)
@@ -1,19 +1,36 @@
+import asyncio
+import signal
 import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from AIS.AIS_Dedup import DuplicateFilter
+from AIS.AIS_Reassembly import FragmentReassembler
+from NMEA.NMEA_Metrics import Metrics, decode_lines_measured, measured_sink, serve_metrics
+from NMEA.NMEA_Profile import profile_on_signal
+from NMEA.NMEA_Stream import decode_lines
 
 # Server address and port
 SERVER_IP = '127.0.0.1'
 SERVER_PORT = 12345
 
+# Datagrams waiting to be decoded; beyond this new ones are dropped and counted
+MAX_QUEUED_DATAGRAMS = 10000
+
+# Datagrams handed to the decoder thread in one go
+DECODE_BATCH_SIZE = 512
+
+
 def receive_messages():
     # Create UDP socket
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
         # Bind to server address and port
         sock.bind((SERVER_IP, SERVER_PORT))
         print(f"Listening on {SERVER_IP}:{SERVER_PORT}")
-        
+
         while True:
-            # Receive message from client
-            message_bytes, addr = sock.recvfrom(1024)
+            # Receive message from client (65535 is the largest UDP datagram)
+            message_bytes, addr = sock.recvfrom(65535)
             # Decode bytes to string
             message = message_bytes.decode('ascii')
             print(f"Received: {message}")
@@ -21,5 +38,123 @@ def receive_messages():
                 print("Exiting...")
                 break
 
+
+class NMEAFeedProtocol(asyncio.DatagramProtocol):
+    """Queue every datagram from one feed; decoding happens elsewhere."""
+
+    def __init__(self, feed, queue, counters):
+        self.feed = feed
+        self.queue = queue
+        self.counters = counters
+
+    def datagram_received(self, data, addr):
+        try:
+            self.queue.put_nowait((self.feed, data))
+            self.counters["received"] += 1
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+
+
+def print_record(feed, kind, record):
+    print(f"[{feed}] {kind}: {record}")
+
+
+def decode_datagrams(batch, reassemblers, duplicates=None, prefilter=None, metrics=None):
+    """Decode a batch of (feed, datagram) pairs; runs on the decoder thread.
+
+    With `metrics` (a Metrics registry) every stage is counted and sampled
+    for latency per feed.
+    """
+    records = []
+    for feed, data in batch:
+        reassembler = reassemblers.get(feed)
+        if reassembler is None:
+            reassembler = reassemblers[feed] = FragmentReassembler()
+        # A datagram may carry several sentences
+        if metrics is None:
+            decoded = decode_lines(data.split(b"\n"), reassembler, feed, None, duplicates, prefilter)
+        else:
+            decoded = decode_lines_measured(data.split(b"\n"), metrics, reassembler, feed, duplicates, prefilter)
+        for kind, record in decoded:
+            records.append((feed, kind, record))
+    return records
+
+
+def handle_records(handle_record, records):
+    """Pass decoded (feed, kind, record) tuples to the sink; runs on the sink thread."""
+    for record in records:
+        handle_record(*record)
+
+
+async def serve_feeds(ports, host=SERVER_IP, handle_record=print_record, prefilter=None, metrics=None):
+    """Listen on several UDP ports at once, one per receiver or feed.
+
+    Sentences are routed by prefix to the AIS, GPRMC and GINAV decoders on a
+    separate thread, so the event loop only ever queues datagrams.
+    `handle_record(feed, kind, record)` is called on a third thread, one
+    batch at a time and in arrival order, so a slow sink (e.g. a SQLiteSink
+    committing a batch) delays neither the loop nor the next decode. An AIS
+    message already received on another feed or channel is decoded only
+    once, and one rejected by `prefilter` (a HeaderFilter) not at all.
+    With `metrics` (a Metrics registry) the decoder stages and
+    `handle_record` are measured. A datagram reading 'exit' stops the server.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(MAX_QUEUED_DATAGRAMS)
+    counters = {"received": 0, "dropped": 0}
+    if metrics is not None:
+        handle_record = measured_sink(handle_record, metrics)
+
+    transports = []
+    for port in ports:
+        feed = f"{host}:{port}"
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda feed=feed: NMEAFeedProtocol(feed, queue, counters), local_addr=(host, port))
+        transports.append(transport)
+        print(f"Listening on {feed}")
+
+    # One decoder thread keeps the per-feed reassemblers single-threaded
+    executor = ThreadPoolExecutor(max_workers=1)
+    # One sink thread keeps records in order; at most one decoded batch waits for it
+    sink_executor = ThreadPoolExecutor(max_workers=1)
+    handled = None
+    reassemblers = {}
+    # Shared across feeds: overlapping stations hear the same transmissions
+    duplicates = DuplicateFilter()
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < DECODE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            stop = any(data.strip().lower() == b"exit" for _, data in batch)
+            batch = [item for item in batch if item[1].strip().lower() != b"exit"]
+
+            records = await loop.run_in_executor(executor, decode_datagrams, batch, reassemblers, duplicates,
+                                                 prefilter, metrics)
+            if handled is not None:
+                await handled
+            handled = loop.run_in_executor(sink_executor, handle_records, handle_record, records)
+
+            if stop:
+                await handled
+                print("Exiting...")
+                break
+    finally:
+        for transport in transports:
+            transport.close()
+        executor.shutdown()
+        sink_executor.shutdown()
+    counters["duplicates"] = duplicates.counters["duplicates"]
+    return counters
+
+
 if __name__ == "__main__":
-    receive_messages()
+    ports = [int(port) for port in sys.argv[1:]] or [SERVER_PORT]
+    metrics = Metrics()
+    server = serve_metrics(metrics)
+    print(f"Metrics at http://127.0.0.1:{server.server_port}/metrics")
+    if hasattr(signal, "SIGUSR1"):
+        # kill -USR1 <pid> profiles the decoders for a while without a restart
+        profile_on_signal(signal.SIGUSR1)
+    print(asyncio.run(serve_feeds(ports, metrics=metrics)))
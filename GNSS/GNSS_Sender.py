@@ -1,22 +1,139 @@
+import argparse
 import socket
+import time
 
 # Server address and port
 SERVER_IP = '127.0.0.1'
 SERVER_PORT = 12345
 
-def send_message(message):
-    # Create UDP socket
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        # Encode message to bytes
-        message_bytes = message.encode('ascii')
-        # Send message to server
-        print(message_bytes)
+# Keep packed datagrams under a typical Ethernet MTU
+MAX_DATAGRAM_BYTES = 1400
+
+
+def send_message(message, sock=None):
+    """Send one message, reusing `sock` when given instead of opening a new socket."""
+    message_bytes = message.encode('ascii')
+    if sock is None:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(message_bytes, (SERVER_IP, SERVER_PORT))
+    else:
         sock.sendto(message_bytes, (SERVER_IP, SERVER_PORT))
-        print(f"Sent: {message}")
+    print(f"Sent: {message}")
+
+
+def split_timestamp(line):
+    """Split a recorded line into (unix time or None, bare sentence).
+
+    Understands NMEA 4 tag blocks (\\c:1700000000,s:rx1*hh\\!AIVDM...) and a
+    leading numeric timestamp ("1700000000.25 $GPRMC,...").
+    """
+    if line.startswith(b"\\"):
+        end = line.find(b"\\", 1)
+        timestamp = None
+        for param in line[1:end].split(b"*")[0].split(b","):
+            if param.startswith(b"c:"):
+                timestamp = float(param[2:])
+                if timestamp > 1e11:  # milliseconds
+                    timestamp /= 1000.0
+        return timestamp, line[end + 1:]
+
+    head, _, rest = line.partition(b" ")
+    if rest and head[:1].isdigit():
+        try:
+            return float(head), rest
+        except ValueError:
+            pass
+    return None, line
+
+
+def replay_log(path, speed=None, per_datagram=1, host=SERVER_IP, port=SERVER_PORT, repeat=1):
+    """Stream a recorded NMEA log to a UDP receiver over one persistent socket.
+
+    speed=None sends as fast as possible; otherwise recorded timestamps are
+    honoured, scaled by `speed` (1.0 is real time). Up to `per_datagram`
+    sentences are packed into each datagram, newline separated.
+    Returns the number of sentences and datagrams sent and the achieved rate.
+    """
+    address = (host, port)
+    sentences = datagrams = 0
+    pending = []
+    pending_bytes = 0
+    first_stamp = None
+    started = replay_started = time.perf_counter()
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sendto = sock.sendto
+
+        def flush():
+            nonlocal datagrams, pending_bytes
+            sendto(b"\n".join(pending), address)
+            datagrams += 1
+            pending.clear()
+            pending_bytes = 0
+
+        for _ in range(repeat):
+            with open(path, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    if speed is not None:
+                        stamp, line = split_timestamp(line)
+                        if stamp is not None:
+                            if first_stamp is None:
+                                first_stamp = stamp
+                            delay = (stamp - first_stamp) / speed - (time.perf_counter() - replay_started)
+                            if delay > 0:
+                                if pending:
+                                    flush()
+                                time.sleep(delay)
+                    elif line[:1] not in (b"!", b"$"):
+                        line = split_timestamp(line)[1]
+
+                    if pending and pending_bytes + len(line) + 1 > MAX_DATAGRAM_BYTES:
+                        flush()
+                    pending.append(line)
+                    pending_bytes += len(line) + 1
+                    sentences += 1
+                    if len(pending) >= per_datagram:
+                        flush()
+
+            # Recorded times restart with each repeat
+            first_stamp = None
+            replay_started = time.perf_counter()
+
+        if pending:
+            flush()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "sentences": sentences,
+        "datagrams": datagrams,
+        "seconds": elapsed,
+        "sentences_per_sec": sentences / elapsed if elapsed else 0.0,
+    }
+
 
 if __name__ == "__main__":
-    while True:
-        msg = input("Enter message to send (or 'exit' to quit): ")
-        if msg.lower() == 'exit':
-            break
-        send_message(msg)
+    parser = argparse.ArgumentParser(description="Send NMEA sentences over UDP")
+    parser.add_argument("--replay", help="recorded NMEA log to stream instead of prompting")
+    parser.add_argument("--speed", type=float, help="replay speed factor (1 = real time); omit for max rate")
+    parser.add_argument("--batch", type=int, default=1, help="sentences packed per datagram")
+    parser.add_argument("--repeat", type=int, default=1, help="times to replay the log")
+    parser.add_argument("--host", default=SERVER_IP)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+
+    if args.replay:
+        stats = replay_log(args.replay, args.speed, args.batch, args.host, args.port, args.repeat)
+        print(f"Sent {stats['sentences']} sentences in {stats['datagrams']} datagrams "
+              f"({stats['sentences_per_sec']:,.0f} sentences/sec)")
+    else:
+        SERVER_IP, SERVER_PORT = args.host, args.port
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            while True:
+                msg = input("Enter message to send (or 'exit' to quit): ")
+                if msg.lower() == 'exit':
+                    break
+                send_message(msg, sock)
@@ -1,53 +1,106 @@
-def parse_gprmc_sentence(sentence):
-    if not sentence.startswith("$GPRMC"):
-        raise ValueError("Not a GPRMC NMEA sentence")
-    
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from NMEA.NMEA_Framing import frame_sentence, verify_sentence
+
+# Parsed $GPRMC sentence. time is a UTC datetime, latitude/longitude are signed
+# decimal degrees, speed is in knots and course in degrees; missing values are None.
+GPRMCRecord = namedtuple("GPRMCRecord", [
+    "time", "status", "latitude", "longitude", "speed_knots", "course_degrees", "mode_indicator",
+])
+
+
+def nmea_to_decimal_degrees(value, direction):
+    """Convert an NMEA (d)ddmm.mmmm coordinate and its N/S/E/W letter to signed decimal degrees."""
+    if not value:
+        return None
+    dot = value.find('.')
+    if dot == -1:
+        dot = len(value)
+    degrees = int(value[:dot - 2] or 0) + float(value[dot - 2:]) / 60.0
+    return -degrees if direction in ('S', 'W') else degrees
+
+
+def parse_utc(time_utc, date):
+    """Combine NMEA hhmmss.sss and ddmmyy fields into a UTC datetime."""
+    if not time_utc or not date:
+        return None
+    seconds = float(time_utc[4:])
+    year = int(date[4:6])
+    return datetime(
+        2000 + year if year < 80 else 1900 + year, int(date[2:4]), int(date[0:2]),
+        int(time_utc[0:2]), int(time_utc[2:4]), int(seconds), round((seconds % 1) * 1e6) % 1000000,
+        tzinfo=timezone.utc,
+    )
+
+
+def _float(value):
+    return float(value) if value else None
+
+
+def _parse_fields(sentence):
     # Remove the prefix and the checksum
     data_part = sentence[7:].split('*')[0]  # Remove '$GPRMC,' and data after '*'
-    checksum_provided = sentence.split('*')[1].strip().split('\r')[0]  # Extract checksum part
 
     # Split the sentence into fields
     fields = data_part.split(',')
-    
+
     if len(fields) < 9:
         raise ValueError("Incomplete GPRMC sentence")
-    
-    # Extract fields
-    time_utc = fields[0]
-    status = fields[1]
-    latitude = fields[2]
-    lat_direction = fields[3]
-    longitude = fields[4]
-    lon_direction = fields[5]
-    speed_knots = fields[6]
-    course_degrees = fields[7]
-    date = fields[8]
-    mode_indicator = fields[9] if len(fields) > 9 else ''
-    
-    # Calculate checksum
-    checksum_calculated = 0
-    for char in sentence[1:sentence.find('*')]:  # Calculate checksum over the data part before '*'
-        checksum_calculated ^= ord(char)
-    
-    # Convert checksum to hexadecimal
-    checksum_calculated_hex = format(checksum_calculated, '02X')
-    
-    # Print extracted data
-    print(f"Time (UTC): {time_utc}")
-    print(f"Status: {status}")
-    print(f"Latitude: {latitude} {lat_direction}")
-    print(f"Longitude: {longitude} {lon_direction}")
-    print(f"Speed over Ground (knots): {speed_knots}")
-    print(f"Course over Ground (degrees): {course_degrees}")
-    print(f"Date: {date}")
-    print(f"Mode Indicator: {mode_indicator}")
-    
-    # Validate checksum
-    if checksum_provided == checksum_calculated_hex:
-        print("Checksum validation passed.")
-    else:
-        print(f"Checksum validation failed. Calculated: {checksum_calculated_hex}, Provided: {checksum_provided}")
 
-# Example sentence
-nmea_sentence = "$GPRMC,151227.3997,A,4723.5403567,N,00826.8867153,E,0.00000,81.6172,111022,,,R*4F\r\n"
-parse_gprmc_sentence(nmea_sentence)
+    return GPRMCRecord(
+        time=parse_utc(fields[0], fields[8]),
+        status=fields[1],
+        latitude=nmea_to_decimal_degrees(fields[2], fields[3]),
+        longitude=nmea_to_decimal_degrees(fields[4], fields[5]),
+        speed_knots=_float(fields[6]),
+        course_degrees=_float(fields[7]),
+        # Fields 9-10 are magnetic variation; the mode indicator only exists from NMEA 2.3 on
+        mode_indicator=fields[11] if len(fields) > 11 else '',
+    )
+
+
+def parse_gprmc_sentence(sentence):
+    if not sentence.startswith("$GPRMC"):
+        raise ValueError("Not a GPRMC NMEA sentence")
+
+    # Reject corrupt sentences before touching any fields
+    verify_sentence(sentence)
+
+    return _parse_fields(sentence)
+
+
+def parse_gprmc_sentences(sentences):
+    """Parse a list of GPRMC sentences; entries that are corrupt or not GPRMC become None."""
+    records = []
+    for sentence in sentences:
+        framed = frame_sentence(sentence)
+        if framed is None or not framed.startswith(b"$GPRMC"):
+            records.append(None)
+            continue
+        try:
+            records.append(_parse_fields(framed.decode('ascii')))
+        except ValueError:
+            records.append(None)
+    return records
+
+
+def print_gprmc(record):
+    """Print a parsed GPRMC record field by field."""
+    print(f"Time (UTC): {record.time}")
+    print(f"Status: {record.status}")
+    print(f"Latitude: {record.latitude}")
+    print(f"Longitude: {record.longitude}")
+    print(f"Speed over Ground (knots): {record.speed_knots}")
+    print(f"Course over Ground (degrees): {record.course_degrees}")
+    print(f"Mode Indicator: {record.mode_indicator}")
+
+
+if __name__ == "__main__":
+    # Example sentence
+    nmea_sentence = "$GPRMC,151227.3997,A,4723.5403567,N,00826.8867153,E,0.00000,81.6172,111022,,,R*4F\r\n"
+    try:
+        print_gprmc(parse_gprmc_sentence(nmea_sentence))
+        print("Checksum validation passed.")
+    except ValueError as e:
+        print(e)
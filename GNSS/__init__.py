@@ -0,0 +1 @@
+"""GNSS sentence parsers and the UDP sender/receiver."""
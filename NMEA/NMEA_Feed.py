@@ -0,0 +1,110 @@
+import os
+import queue
+import socket
+import threading
+import time
+
+from AIS.AIS_Reassembly import FragmentReassembler
+from NMEA.NMEA_Stream import decode_lines
+
+# Decoded lines waiting for the consumer; beyond this new ones are dropped and counted
+MAX_QUEUED_RECORDS = 50000
+
+# Kernel receive buffer requested for UDP feeds, to ride out bursts while decoding
+UDP_RECEIVE_BUFFER = 4 * 1024 * 1024
+
+# How often a blocked read wakes up to check for stop()
+POLL_INTERVAL = 0.2
+
+
+def parse_source(source):
+    """'udp:PORT' or 'udp:HOST:PORT' -> ("udp", (host, port)); anything else is a file path to tail."""
+    if source.startswith("udp:"):
+        host, _, port = source[4:].rpartition(":")
+        return "udp", (host or "127.0.0.1", int(port))
+    return "file", source
+
+
+class FeedReader(threading.Thread):
+    """Background thread reading NMEA from a UDP port or a growing file.
+
+    Lines are decoded on this thread and (kind, record) tuples put on
+    `records` without blocking; when the consumer falls behind, records are
+    dropped and counted rather than stalling the feed. A file is followed
+    from its current end, like `tail -f`. If reading fails (say the UDP port
+    is taken), the thread ends with the exception in `error`.
+    """
+
+    def __init__(self, source, records=None):
+        super().__init__(daemon=True)
+        self.kind, self.address = parse_source(source)
+        self.records = queue.Queue(MAX_QUEUED_RECORDS) if records is None else records
+        self.counters = {"received": 0, "dropped": 0}
+        self.stopped = threading.Event()
+        self.error = None
+
+    def stop(self, wait=True):
+        """Ask the thread to end; by default wait until it has, so its socket or file is closed."""
+        self.stopped.set()
+        if wait and self.is_alive():
+            self.join()
+
+    def _publish(self, lines, reassembler):
+        put = self.records.put_nowait
+        counters = self.counters
+        for item in decode_lines(lines, reassembler, self.kind):
+            counters["received"] += 1
+            try:
+                put(item)
+            except queue.Full:
+                counters["dropped"] += 1
+
+    def _read_udp(self):
+        reassembler = FragmentReassembler()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+            sock.bind(self.address)
+            sock.settimeout(POLL_INTERVAL)
+            while not self.stopped.is_set():
+                try:
+                    data = sock.recv(65535)
+                except socket.timeout:
+                    continue
+                self._publish(data.split(b"\n"), reassembler)
+
+    def _read_file(self):
+        reassembler = FragmentReassembler()
+        with open(self.address, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            partial = b""
+            while not self.stopped.is_set():
+                data = f.read(1 << 20)
+                if not data:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                # Hold back an unfinished last line until the writer completes it
+                lines = (partial + data).split(b"\n")
+                partial = lines.pop()
+                self._publish(lines, reassembler)
+
+    def run(self):
+        try:
+            if self.kind == "udp":
+                self._read_udp()
+            else:
+                self._read_file()
+        except Exception as e:
+            self.error = e
+
+
+if __name__ == "__main__":
+    import sys
+
+    reader = FeedReader(sys.argv[1] if len(sys.argv) > 1 else "udp:12345")
+    reader.start()
+    try:
+        while True:
+            kind, record = reader.records.get()
+            print(kind, record)
+    except KeyboardInterrupt:
+        reader.stop()
@@ -0,0 +1,79 @@
+STAR = ord("*")
+START_CHARS = (ord("!"), ord("$"))
+
+# Per-length fold schedule for nmea_checksum: (shift, mask) pairs halving the width
+_FOLDS = {}
+
+
+def nmea_checksum(body):
+    """XOR of every byte between the leading '!'/'$' and the '*'.
+
+    The body is read as one integer and folded in half repeatedly, so the
+    work is a handful of big-int operations instead of a per-byte loop.
+    """
+    if isinstance(body, str):
+        body = body.encode("ascii", "replace")
+    size = len(body)
+    folds = _FOLDS.get(size)
+    if folds is None:
+        folds = []
+        width = size
+        while width > 1:
+            half = (width + 1) // 2
+            folds.append((half * 8, (1 << (half * 8)) - 1))
+            width = half
+        _FOLDS[size] = folds
+
+    value = int.from_bytes(body, "little")
+    for shift, mask in folds:
+        value = (value >> shift) ^ (value & mask)
+    return value
+
+
+def bare_sentence(line):
+    """Strip whitespace and any NMEA 4 tag block; return (sentence, star index) or None."""
+    if isinstance(line, str):
+        line = line.encode("ascii", "replace")
+    line = line.strip()
+    if line[:1] == b"\\":
+        end = line.find(b"\\", 1)
+        if end == -1:
+            return None
+        line = line[end + 1:]
+
+    star = len(line) - 3
+    if star < 1 or line[star] != STAR or line[0] not in START_CHARS:
+        return None
+    return line, star
+
+
+def frame_sentence(line):
+    """Return the bare sentence (bytes) if framing and checksum are valid, else None.
+
+    Cheap structural checks run first, so most corrupt lines are rejected
+    without computing a checksum, and nothing is split or decoded.
+    """
+    framed = bare_sentence(line)
+    if framed is None:
+        return None
+    line, star = framed
+    try:
+        provided = int(line[star + 1:], 16)
+    except ValueError:
+        return None
+    if nmea_checksum(line[1:star]) != provided:
+        return None
+    return line
+
+
+def verify_sentence(line):
+    """Like frame_sentence, but raise ValueError saying what is wrong."""
+    framed = bare_sentence(line)
+    if framed is None:
+        raise ValueError("Malformed NMEA sentence: expected '!' or '$' ... '*hh'")
+    line, star = framed
+    provided = line[star + 1:].decode("ascii", "replace")
+    calculated = format(nmea_checksum(line[1:star]), '02X')
+    if provided.upper() != calculated:
+        raise ValueError(f"Checksum validation failed. Calculated: {calculated}, Provided: {provided}")
+    return line
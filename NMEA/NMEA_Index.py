@@ -0,0 +1,240 @@
+import mmap
+from array import array
+
+import numpy as np
+
+from AIS.AIS_Manual import decode_ais_payload
+from AIS.AIS_Reassembly import FragmentReassembler
+from GNSS.GINAV import parse_ginav_sentence
+from GNSS.GPRMC import parse_gprmc_sentence
+from NMEA.NMEA_Framing import frame_sentence
+from NMEA.NMEA_Stream import AIS_PREFIXES
+
+KINDS = ("AIS", "GPRMC", "GINAV", "error")
+AIS, GPRMC, GINAV, ERROR = range(len(KINDS))
+
+# Numeric columns kept per decoded message; missing values are NaN (floats) or 0
+COLUMNS = {
+    "kind": np.uint8,
+    "message_type": np.uint8,
+    "mmsi": np.uint32,
+    "latitude": np.float64,
+    "longitude": np.float64,
+    "speed_over_ground": np.float32,
+    "course_over_ground": np.float32,
+    "true_heading": np.uint16,
+}
+
+_ARRAY_CODES = {np.uint8: "B", np.uint32: "I", np.float64: "d", np.float32: "f", np.uint16: "H"}
+
+# Batch reprocessing follows file order, not wall-clock time
+NO_TIMEOUT = float("inf")
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) else float("nan")
+
+
+def _format(value, spec):
+    return "" if value != value else format(value, spec)  # NaN shows as blank
+
+
+class LogIndex:
+    """Decoded summary of an NMEA log held as NumPy columns, one row per message.
+
+    Only the numeric columns are kept in memory, plus the byte range of the
+    sentences each row came from, so the full record of any row can be
+    decoded again on demand. Sort orders and per-value row lists are built
+    from the columns once and cached, so sorting and filtering a million
+    rows never re-decodes anything.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.progress = 0.0  # fraction of the file read so far, for a progress display
+        self.columns = {}
+        self.first_offset = self.last_offset = None
+        self._orders = {}
+        self._sorted = {}
+
+    def build(self, stopped=None):
+        """Decode the whole file; `stopped` is an optional threading.Event that aborts the build."""
+        reassembler = FragmentReassembler(max_groups=1 << 20, timeout=NO_TIMEOUT)
+        values = {name: array(_ARRAY_CODES[dtype]) for name, dtype in COLUMNS.items()}
+        first_offset = array("q")
+        last_offset = array("q")
+        group_starts = {}  # (channel, sequence id, count) -> offset of fragment 1
+        nan = float("nan")
+
+        def add_row(kind, start, end, record):
+            values["kind"].append(kind)
+            first_offset.append(start)
+            last_offset.append(end)
+            if not isinstance(record, dict):
+                record = {}
+            values["message_type"].append(record.get("message_type", 0) & 0xFF)
+            values["mmsi"].append(record.get("mmsi", record.get("mmsi_1", 0)) & 0xFFFFFFFF)
+            values["latitude"].append(_number(record.get("latitude", nan)))
+            values["longitude"].append(_number(record.get("longitude", nan)))
+            values["speed_over_ground"].append(_number(record.get("speed_over_ground", nan)))
+            values["course_over_ground"].append(_number(record.get("course_over_ground", nan)))
+            values["true_heading"].append(record.get("true_heading", 511) & 0xFFFF)
+
+        with open(self.path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                mm = b""  # empty file
+            size = len(mm)
+            position = lines = 0
+            while position < size:
+                if stopped is not None and stopped.is_set():
+                    break
+                end = mm.find(b"\n", position)
+                if end == -1:
+                    end = size
+                start, line = position, frame_sentence(mm[position:end])
+                position = end + 1
+                lines += 1
+                if lines & 0xFFFF == 0:
+                    self.progress = position / size
+                if line is None:
+                    continue
+
+                prefix = line[:6]
+                try:
+                    if prefix in AIS_PREFIXES:
+                        fields = line.split(b",")
+                        if fields[1] != b"1":
+                            key = (fields[4], fields[3], fields[1])
+                            if fields[2] == b"1":
+                                group_starts[key] = start
+                        message = reassembler.add(line.decode("ascii"), now=0)
+                        if message is not None:
+                            if fields[1] != b"1":
+                                start = group_starts.pop(key, start)
+                            add_row(AIS, start, end, decode_ais_payload(*message))
+                    elif prefix == b"$GPRMC":
+                        record = parse_gprmc_sentence(line.decode("ascii"))
+                        add_row(GPRMC, start, end, {"latitude": record.latitude, "longitude": record.longitude,
+                                                      "speed_over_ground": record.speed_knots,
+                                                      "course_over_ground": record.course_degrees})
+                    elif prefix == b"$GINAV":
+                        record = parse_ginav_sentence(line.decode("ascii"))
+                        add_row(GINAV, start, end, {"latitude": record.latitude, "longitude": record.longitude})
+                except Exception:
+                    add_row(ERROR, start, end, None)
+            if size:
+                mm.close()
+
+        self.columns = {name: np.frombuffer(values[name], dtype=dtype).copy() for name, dtype in COLUMNS.items()}
+        self.first_offset = np.frombuffer(first_offset, dtype=np.int64).copy()
+        self.last_offset = np.frombuffer(last_offset, dtype=np.int64).copy()
+        self.rows = len(self.first_offset)
+        self._orders = {}
+        self._sorted = {}
+        self.progress = 1.0
+        return self
+
+    def order(self, column):
+        """Row numbers sorted by one column (stable, so ties keep file order); cached."""
+        order = self._orders.get(column)
+        if order is None:
+            order = self._orders[column] = np.argsort(self.columns[column], kind="stable")
+        return order
+
+    def rows_where(self, column, value):
+        """Row numbers, in file order, whose column equals value; a binary search over the cached order."""
+        order = self.order(column)
+        ordered = self._sorted.get(column)
+        if ordered is None:
+            ordered = self._sorted[column] = self.columns[column][order]
+        first, last = np.searchsorted(ordered, value, side="left"), np.searchsorted(ordered, value, side="right")
+        return np.sort(order[first:last])
+
+    def view(self, mmsi=None, message_type=None, sort_by=None, descending=False):
+        """Row numbers to display: filtered by MMSI and/or AIS message type, then sorted by a column."""
+        rows = None
+        if mmsi is not None:
+            rows = self.rows_where("mmsi", mmsi)
+        if message_type is not None:
+            matching = self.rows_where("message_type", message_type)
+            ais = self.columns["kind"][matching] == AIS
+            matching = matching[ais]
+            rows = matching if rows is None else np.intersect1d(rows, matching, assume_unique=True)
+
+        if rows is None:
+            rows = np.arange(self.rows) if sort_by is None else self.order(sort_by)
+        elif sort_by is not None:
+            rows = rows[np.argsort(self.columns[sort_by][rows], kind="stable")]
+
+        if descending:
+            rows = rows[::-1]
+            if sort_by is not None and self.columns[sort_by].dtype.kind == "f":
+                # Keep missing values at the bottom either way
+                missing = np.isnan(self.columns[sort_by][rows])
+                rows = np.concatenate((rows[~missing], rows[missing]))
+        return rows
+
+    def summary(self, row):
+        """Display values of one row: kind/type, MMSI and the numeric columns."""
+        columns = self.columns
+        kind = int(columns["kind"][row])
+        return (
+            int(row),
+            str(columns["message_type"][row]) if kind == AIS else KINDS[kind],
+            int(columns["mmsi"][row]),
+            *(_format(columns[name][row], ".5f") for name in ("latitude", "longitude")),
+            *(_format(columns[name][row], ".1f") for name in ("speed_over_ground", "course_over_ground")),
+            int(columns["true_heading"][row]),
+        )
+
+    def record(self, row):
+        """Decode one row again from the file and return its full record.
+
+        A multi-sentence message is re-read from its first to its last
+        fragment; other messages interleaved in between are decoded and
+        ignored.
+        """
+        start, end = int(self.first_offset[row]), int(self.last_offset[row])
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            lines = f.readline()
+            while f.tell() <= end:
+                lines += f.readline()
+
+        reassembler = FragmentReassembler(timeout=NO_TIMEOUT)
+        result = None
+        for line in lines.split(b"\n"):
+            line = frame_sentence(line)
+            if line is None:
+                continue
+            try:
+                if line[:6] in AIS_PREFIXES:
+                    message = reassembler.add(line.decode("ascii"), now=0)
+                    if message is not None:
+                        result = decode_ais_payload(*message)
+                elif line[:6] == b"$GPRMC":
+                    result = parse_gprmc_sentence(line.decode("ascii"))._asdict()
+                elif line[:6] == b"$GINAV":
+                    result = parse_ginav_sentence(line.decode("ascii"))._asdict()
+            except Exception as e:
+                result = f"Error decoding message: {e}"
+        return result
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    started = time.perf_counter()
+    index = LogIndex(sys.argv[1]).build()
+    print(f"Indexed {index.rows} messages in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    fastest = index.view(sort_by="speed_over_ground", descending=True)[:5]
+    print(f"Sorted by SOG in {(time.perf_counter() - started) * 1000:.1f} ms")
+    for row in fastest:
+        print(index.summary(row))
+    print(index.record(fastest[0]))
@@ -0,0 +1,334 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain, islice
+
+from AIS.AIS_Manual import decode_ais_payload, sixbit_to_binary
+from AIS.AIS_Reassembly import FragmentReassembler
+from GNSS.GINAV import parse_ginav_sentence
+from GNSS.GPRMC import parse_gprmc_sentence
+from NMEA.NMEA_Framing import bare_sentence, frame_sentence
+from NMEA.NMEA_Stream import decode_lines
+
+# Upper bounds (seconds) of the latency histogram buckets; one more bucket catches the rest
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+# Stage latencies are timed on one message in this many; counters are always exact
+SAMPLE_EVERY = 16
+
+# Lines between hand-overs of locally tallied counts to the shared metrics
+FLUSH_EVERY = 1024
+
+DEFAULT_PORT = 9108
+
+STAGE_SECONDS = "nmea_stage_seconds"
+MESSAGES = "nmea_messages_total"
+DECODED = "nmea_decoded_total"
+ERRORS = "nmea_errors_total"
+SKIPPED = "nmea_skipped_total"
+
+
+class ThreadMetrics:
+    """Counters and histograms written by one thread only, so updates need no lock.
+
+    Keys are (metric name, labels) with labels a tuple of (name, value) pairs.
+    """
+
+    __slots__ = ("counters", "histograms", "lines")
+
+    def __init__(self):
+        self.lines = 0  # lines decoded on this thread; drives sampling across short calls
+        self.counters = {}
+        self.histograms = {}  # key -> [count per bucket..., count above the last bucket, sum]
+
+    def count(self, name, labels=(), n=1):
+        key = (name, labels)
+        counters = self.counters
+        counters[key] = counters.get(key, 0) + n
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+
+class Metrics:
+    """Registry of per-thread metrics, merged only when read.
+
+    Each thread gets its own ThreadMetrics on first use (the only time a lock
+    is taken); render() sums them into Prometheus text format and derives a
+    messages/sec gauge per feed from the change since the previous render.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._previous = (time.monotonic(), {})
+
+    def thread(self):
+        """The calling thread's ThreadMetrics."""
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = self._local.state = ThreadMetrics()
+            with self._lock:
+                self._threads.append(state)
+        return state
+
+    def count(self, name, labels=(), n=1):
+        self.thread().count(name, labels, n)
+
+    def observe(self, name, labels, seconds):
+        self.thread().observe(name, labels, seconds)
+
+    def snapshot(self):
+        """Merged (counters, histograms) across all threads."""
+        with self._lock:
+            threads = list(self._threads)
+        counters = {}
+        histograms = {}
+        for state in threads:
+            # list() copies in one step, so a thread adding a key meanwhile is harmless
+            for key, value in list(state.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, values in list(state.histograms.items()):
+                merged = histograms.get(key)
+                histograms[key] = list(values) if merged is None else [a + b for a, b in zip(merged, values)]
+        return counters, histograms
+
+    def messages_per_second(self, counters):
+        """Messages/sec per feed since the previous call."""
+        now = time.monotonic()
+        since, previous = self._previous
+        totals = {labels: value for (name, labels), value in counters.items() if name == MESSAGES}
+        self._previous = (now, totals)
+        elapsed = now - since
+        return {labels: (value - previous.get(labels, 0)) / elapsed if elapsed > 0 else 0.0
+                for labels, value in totals.items()}
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        counters, histograms = self.snapshot()
+        lines = []
+
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+
+        lines.append("# TYPE nmea_messages_per_second gauge")
+        for labels, rate in sorted(self.messages_per_second(counters).items()):
+            lines.append(f"nmea_messages_per_second{_labels(labels)} {rate:.1f}")
+
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, values):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                cumulative += values[len(LATENCY_BUCKETS)]
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {values[-1]:.9f}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def _rejection_cause(line):
+    # Only runs for rejected lines, so the cheap frame_sentence check stays on the hot path
+    return "framing" if bare_sentence(line) is None else "checksum"
+
+
+# decode_lines' counter keys and the metrics they are handed to
+COUNTED = (
+    ("filtered", SKIPPED, (("reason", "filtered"),)),
+    ("duplicate", SKIPPED, (("reason", "duplicate"),)),
+    ("reassembly_errors", ERRORS, (("cause", "reassembly"),)),
+    ("decode_errors", ERRORS, (("cause", "decode"),)),
+)
+
+
+def decode_lines_measured(lines, metrics, reassembler=None, source="", duplicates=None, prefilter=None,
+                          sample_every=SAMPLE_EVERY):
+    """decode_lines with per-stage metrics.
+
+    Counts every line per feed, every decoded message per type, every AIS
+    message skipped by `prefilter` or `duplicates` and every failure by
+    cause (framing, checksum, reassembly, unsupported_type, decode), and on
+    one line in `sample_every` times the framing, reassembly, sixbit and
+    decode stages. Lines are fed to decode_lines in runs: the untimed lines
+    of a run go through it as they are, and the timed line through it again
+    with its stages wrapped in timers. Counts are tallied in locals and
+    handed to the thread's metrics every FLUSH_EVERY lines.
+    """
+    reassembler = FragmentReassembler() if reassembler is None else reassembler
+    add = reassembler.add
+    state = metrics.thread()
+    observe = state.observe
+    perf_counter = time.perf_counter
+    feed = (("feed", source),)
+    seen = flushed = state.lines
+    counters = {}  # decode_lines' counts of rejected, skipped and failed lines
+    decoded = defaultdict(int)  # type -> count since the last flush
+
+    def flush():
+        nonlocal flushed
+        state.count(MESSAGES, feed, seen - flushed)
+        flushed = state.lines = seen
+        for message_type, n in decoded.items():
+            state.count(DECODED, (("type", str(message_type)),), n)
+        decoded.clear()
+        for key, metric, labels in COUNTED:
+            n = counters.pop(key, 0)
+            if n:
+                state.count(metric, labels, n)
+
+    def timing(labels, func, *args):
+        started = perf_counter()
+        result = func(*args)
+        observe(STAGE_SECONDS, labels, perf_counter() - started)
+        return result
+
+    # The decoders are looked up on every call, so DecodeProfiler can patch them mid-stream
+    def decode_ais(payload, fill_bits):
+        # decode_ais_payload unpacks the payload itself (and its time includes that), so the
+        # sixbit stage is timed on a second unpacking
+        timing((("stage", "sixbit"),), sixbit_to_binary, payload, fill_bits)
+        started = perf_counter()
+        record = decode_ais_payload(payload, fill_bits)
+        if record.__class__ is dict:
+            observe(STAGE_SECONDS, (("stage", "decode"), ("type", str(record["message_type"]))),
+                    perf_counter() - started)
+        return record
+
+    timed_stages = {
+        "frame": lambda line: timing((("stage", "framing"),), frame_sentence, line),
+        "add": lambda sentence, source: timing((("stage", "reassembly"),), add, sentence, source),
+        "AIS": decode_ais,
+        "GPRMC": lambda sentence: timing((("stage", "decode"), ("type", "GPRMC")), parse_gprmc_sentence, sentence),
+        "GINAV": lambda sentence: timing((("stage", "decode"), ("type", "GINAV")), parse_ginav_sentence, sentence),
+    }
+
+    lines = iter(lines)
+    try:
+        while True:
+            # The untimed lines before the next timed one (at most FLUSH_EVERY of them), then
+            # that line; `seen` carries across calls, so short calls are sampled too
+            due = sample_every - 1 - seen % sample_every
+            run = list(islice(lines, min(due, FLUSH_EVERY)))
+            timed = list(islice(lines, 1)) if len(run) == due else []
+            if not run and not timed:
+                break
+            seen += len(run) + len(timed)
+            rejected = counters.get("rejected", 0)
+
+            for item in chain(decode_lines(run, reassembler, source, counters, duplicates, prefilter),
+                              decode_lines(timed, reassembler, source, counters, duplicates, prefilter,
+                                           timed_stages)):
+                record = item[1]
+                if record.__class__ is dict:
+                    decoded[record["message_type"]] += 1
+                elif record.__class__ is not str:
+                    decoded[item[0]] += 1
+                elif item[0] == "AIS" and not record.startswith("Error decoding message"):
+                    # decode_ais_payload's answer for a type it has no decoder for;
+                    # decode errors are already counted through counters
+                    state.count(ERRORS, (("cause", "unsupported_type"),))
+                yield item
+
+            if counters.get("rejected", 0) != rejected:
+                for line in run + timed:
+                    if frame_sentence(line) is None:
+                        state.count(ERRORS, (("cause", _rejection_cause(line)),))
+                del counters["rejected"]
+            if seen - flushed >= FLUSH_EVERY:
+                flush()
+    finally:
+        flush()
+
+
+def measured_sink(handle_record, metrics, sample_every=SAMPLE_EVERY):
+    """Wrap a handle_record(feed, kind, record) sink so one call in `sample_every` is timed as stage "sink".
+
+    Exceptions raised by the sink are counted under cause "sink" and re-raised.
+    """
+    calls = 0
+    perf_counter = time.perf_counter
+
+    def handle(*record):
+        nonlocal calls
+        calls += 1
+        try:
+            if calls % sample_every:
+                return handle_record(*record)
+            started = perf_counter()
+            result = handle_record(*record)
+            metrics.observe(STAGE_SECONDS, (("stage", "sink"),), perf_counter() - started)
+            return result
+        except Exception:
+            metrics.count(ERRORS, (("cause", "sink"),))
+            raise
+
+    return handle
+
+
+def serve_metrics(metrics, port=DEFAULT_PORT, host="127.0.0.1"):
+    """Serve metrics.render() at http://host:port/metrics on a daemon thread; returns the server."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep scrapes out of the console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def log_snapshots(metrics, interval=60.0, log=print):
+    """Pass metrics.render() to `log` every `interval` seconds; set the returned Event to stop."""
+    stopped = threading.Event()
+
+    def run():
+        while not stopped.wait(interval):
+            log(metrics.render())
+
+    threading.Thread(target=run, daemon=True).start()
+    return stopped
+
+
+if __name__ == "__main__":
+    import sys
+
+    from NMEA.NMEA_Stream import iter_lines
+
+    metrics = Metrics()
+    server = serve_metrics(metrics)
+    print(f"Metrics at http://127.0.0.1:{server.server_port}/metrics")
+    for _ in decode_lines_measured(iter_lines(sys.argv[1]), metrics, source=sys.argv[1]):
+        pass
+    print(metrics.render())
@@ -0,0 +1,181 @@
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from AIS.AIS_Manual import decode_ais_payload
+from AIS.AIS_Reassembly import FragmentReassembler
+from NMEA.NMEA_Framing import frame_sentence
+from NMEA.NMEA_Stream import AIS_PREFIXES
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Batch reprocessing follows file order, not wall-clock time, so workers never expire groups
+NO_TIMEOUT = float("inf")
+
+
+def split_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split a file into (start, end) byte ranges that begin and end on line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    ranges = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _decode(payload, fill_bits):
+    try:
+        return decode_ais_payload(payload, fill_bits)
+    except Exception as e:
+        return f"Error decoding message: {e}"
+
+
+def decode_chunk(path, start, end):
+    """Decode the AIS lines in one byte range of a file.
+
+    Returns (results, unmatched). results is a list of (line_no, record) for
+    every message completed inside the range. unmatched is a list of
+    (line_no, sentence) for fragments whose group crosses the range edges,
+    plus (line_no, key) at the first fragment 1 of each group key in the
+    range: from there on, a group left open by an earlier range can no
+    longer be joined. The caller finishes both in file order.
+    """
+    reassembler = FragmentReassembler(max_groups=sys.maxsize, timeout=NO_TIMEOUT)
+    counters = reassembler.counters
+    pending = {}  # group key -> [(line_no, sentence)] for groups started in this range
+    started = set()  # keys whose fragment 1 was seen in this range
+    results = []
+    unmatched = []
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        line_no = 0
+        while position < end:
+            line_end = mm.find(b"\n", position, end)
+            if line_end == -1:
+                line_end = end
+            line = frame_sentence(mm[position:line_end])
+            position = line_end + 1
+
+            if line is not None and line[:6] in AIS_PREFIXES:
+                sentence = line.decode("ascii", "replace")
+                try:
+                    fields = sentence.split(',')
+                    if fields[1] == "1":
+                        results.append((line_no, _decode(*reassembler.add(sentence))))
+                    else:
+                        orphans = counters["orphans"]
+                        message = reassembler.add(sentence, now=0)
+                        key = ("", fields[4], fields[3], int(fields[1]))
+                        if counters["orphans"] != orphans:
+                            # Probably the tail of a group started in an earlier range
+                            unmatched.append((line_no, sentence))
+                        elif fields[2] == "1":
+                            if key not in started:
+                                started.add(key)
+                                unmatched.append((line_no, key))
+                            pending[key] = [(line_no, sentence)]
+                        else:
+                            pending[key].append((line_no, sentence))
+
+                        if message is not None:
+                            del pending[key]
+                            results.append((line_no, _decode(*message)))
+                except Exception as e:
+                    results.append((line_no, f"Error decoding message: {e}"))
+            line_no += 1
+
+    # Groups still open at the end of the range may finish in the next one
+    for lines in pending.values():
+        unmatched.extend(lines)
+    # Markers sort before the fragment 1 on the same line
+    unmatched.sort(key=lambda item: (item[0], isinstance(item[1], str)))
+    return results, unmatched
+
+
+def _finish_unmatched(reassembler, unmatched):
+    """Run boundary fragments through the shared reassembler, in file order."""
+    results = []
+    for line_no, sentence in unmatched:
+        if isinstance(sentence, tuple):
+            # The key restarted in this range: drop any stale group an earlier range left open
+            reassembler.groups.pop(sentence, None)
+            continue
+        try:
+            message = reassembler.add(sentence, now=0)
+        except Exception as e:
+            results.append((line_no, f"Error decoding message: {e}"))
+            continue
+        if message is not None:
+            results.append((line_no, _decode(*message)))
+    return results
+
+
+def decode_file_parallel(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True):
+    """Decode an AIS log file across a process pool.
+
+    Yields decoded records. With ordered=True they come out in file order;
+    otherwise each chunk's records are yielded as soon as that chunk is done
+    and messages spanning chunk edges come last.
+    """
+    ranges = split_file(path, chunk_size)
+    reassembler = FragmentReassembler(max_groups=sys.maxsize, timeout=NO_TIMEOUT)
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded window of chunks in flight so results do not pile up in memory
+        todo = deque(enumerate(ranges))
+        running = {}
+
+        # Finished chunks waiting for an earlier one to be yielded (ordered mode)
+        done = {}
+
+        def submit():
+            while todo and len(running) + len(done) < workers * 2:
+                index, (start, end) = todo.popleft()
+                running[executor.submit(decode_chunk, path, start, end)] = index
+
+        submit()
+        if ordered:
+            next_index = 0
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[running.pop(future)] = future.result()
+                while next_index in done:
+                    results, unmatched = done.pop(next_index)
+                    results += _finish_unmatched(reassembler, unmatched)
+                    results.sort(key=lambda item: item[0])
+                    for _, record in results:
+                        yield record
+                    next_index += 1
+                # Submitted only once yielded chunks have left the window
+                submit()
+        else:
+            leftovers = {}
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    results, unmatched = future.result()
+                    leftovers[index] = unmatched
+                    for _, record in results:
+                        yield record
+                submit()
+            for index in sorted(leftovers):
+                for _, record in _finish_unmatched(reassembler, leftovers[index]):
+                    yield record
+
+
+if __name__ == "__main__":
+    for record in decode_file_parallel(sys.argv[1]):
+        print(record)
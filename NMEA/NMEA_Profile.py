@@ -0,0 +1,231 @@
+import cProfile
+import functools
+import io
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+
+# Decoder entry points that can be profiled, as (module, function). Only modules
+# already imported are patched, so switching profiling on never imports pyais.
+ENTRY_POINTS = (
+    ("AIS.AIS_Manual", "decode_ais_message"),
+    ("AIS.AIS_Manual", "decode_ais_payload"),  # what the stream, feed and measured decoders call
+    ("AIS.AIS_pyais", "decode_ais_message"),
+    ("GNSS.GPRMC", "parse_gprmc_sentence"),
+    ("GNSS.GINAV", "parse_ginav_sentence"),
+)
+
+# Profile one entry point call in this many by default
+SAMPLE_EVERY = 100
+
+# Rows in each section of the report
+TOP_ENTRIES = 25
+
+# Stack frames kept per allocation; 1 ranks allocation sites by line
+ALLOCATION_FRAMES = 1
+
+# Default window for a profile started by signal
+SIGNAL_WINDOW = 30.0
+
+# Allocations made by the profiler itself are left out of the report
+_OWN_FILES = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+
+class DecodeProfiler:
+    """Profile a sample of the calls to the decoder entry points.
+
+    While installed, one call in `sample_every` is profiled; the others pay
+    only a counter and a modulo. Sampled calls alternate between cProfile
+    (time per function) and tracemalloc (bytes allocated per source line),
+    so neither one's overhead shows up in the other's numbers. Profiling
+    stops after `duration` seconds or `max_samples` samples, whichever
+    comes first, and the report is written to `report_path` if given.
+    """
+
+    def __init__(self, sample_every=SAMPLE_EVERY, duration=None, max_samples=None, report_path=None,
+                 top=TOP_ENTRIES, entry_points=ENTRY_POINTS):
+        self.sample_every = sample_every
+        self.duration = duration
+        self.max_samples = max_samples
+        self.report_path = report_path
+        self.top = top
+        self.entry_points = entry_points
+        self.calls = 0
+        self.samples = 0
+        self.profile = cProfile.Profile()
+        self.timed_samples = 0
+        self.allocations = {}  # "file:line" -> [bytes, blocks]
+        self.started = self.stopped = None
+        self._sampling = threading.Lock()  # one sample at a time, and none nested
+        self._switch = threading.Lock()
+        self._patched = []  # (module namespace, name, original, wrapper)
+        self._timer = None
+
+    def wrap(self, func):
+        """func with sampled profiling around it."""
+
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            self.calls += 1
+            if self.calls % self.sample_every or not self._sampling.acquire(blocking=False):
+                return func(*args, **kwargs)
+            try:
+                return self._sample(func, args, kwargs)
+            finally:
+                self._sampling.release()
+                if self.max_samples is not None and self.samples >= self.max_samples:
+                    self.stop()
+
+        return profiled
+
+    def _sample(self, func, args, kwargs):
+        self.samples += 1
+        if self.samples % 2:
+            self.timed_samples += 1
+            self.profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.profile.disable()
+
+        # Only allocations still alive when the call returns (e.g. the record) are counted
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start(ALLOCATION_FRAMES)
+        before = tracemalloc.take_snapshot()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            after = tracemalloc.take_snapshot().filter_traces(_OWN_FILES)
+            if not already_tracing:
+                tracemalloc.stop()
+            allocations = self.allocations
+            for stat in after.compare_to(before.filter_traces(_OWN_FILES), "lineno"):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    site = allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                    site[0] += stat.size_diff
+                    site[1] += max(stat.count_diff, 0)
+
+    def install(self):
+        """Replace the entry points with profiled wrappers wherever they are bound."""
+        loaded = list(sys.modules.values())
+        for module_name, name in self.entry_points:
+            module = sys.modules.get(module_name)
+            original = getattr(module, name, None)
+            if original is None:
+                continue
+            wrapper = self.wrap(original)
+            # Also rebind `from module import name` copies, e.g. in NMEA_Stream
+            for other in loaded:
+                namespace = getattr(other, "__dict__", None)
+                if namespace is None:
+                    continue
+                for key, value in list(namespace.items()):
+                    if value is original:
+                        namespace[key] = wrapper
+                        self._patched.append((namespace, key, original, wrapper))
+
+    def uninstall(self):
+        for namespace, key, original, wrapper in self._patched:
+            if namespace.get(key) is wrapper:
+                namespace[key] = original
+        self._patched = []
+
+    def start(self):
+        with self._switch:
+            if self.started is None:
+                self.started = time.monotonic()
+                self.install()
+                if self.duration is not None:
+                    self._timer = threading.Timer(self.duration, self.stop)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return self
+
+    def stop(self):
+        """Stop profiling (once), write the report if a path was given and return it."""
+        with self._switch:
+            if self.started is None or self.stopped is not None:
+                return None
+            self.stopped = time.monotonic()
+            self.uninstall()
+            if self._timer is not None:
+                self._timer.cancel()
+        # Let a sample still running on another thread finish
+        with self._sampling:
+            report = self.report()
+        if self.report_path is not None:
+            with open(self.report_path, "w") as f:
+                f.write(report)
+        return report
+
+    def report(self):
+        """Functions ranked by time and allocation sites ranked by bytes, as text."""
+        elapsed = (self.stopped or time.monotonic()) - (self.started or time.monotonic())
+        out = io.StringIO()
+        out.write(f"Decode profile: {self.samples} of {self.calls} calls sampled over {elapsed:.1f} s\n\n")
+
+        out.write(f"Functions by time ({self.timed_samples} samples)\n")
+        if self.timed_samples:
+            stats = pstats.Stats(self.profile, stream=out)
+            stats.strip_dirs().sort_stats("tottime").print_stats(self.top)
+        else:
+            out.write("  no samples\n\n")
+
+        out.write(f"Allocation sites by bytes ({self.samples - self.timed_samples} samples)\n")
+        ranked = sorted(self.allocations.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+        for site, (size, blocks) in ranked:
+            out.write(f"{size:>12} B {blocks:>8} blocks  {site}\n")
+        if not ranked:
+            out.write("  no samples\n")
+        return out.getvalue()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def profile_on_signal(signum=getattr(signal, "SIGUSR1", None), duration=SIGNAL_WINDOW, **options):
+    """Profile the live process for `duration` seconds each time it receives `signum`.
+
+    Each window writes decode-profile-<time>.txt to the working directory
+    unless report_path is given. A signal during a running window is
+    ignored. Must be called from the main thread.
+    """
+    running = [None]
+
+    def handle(signum, frame):
+        profiler = running[0]
+        if profiler is not None and profiler.stopped is None:
+            return
+        report_path = options.get("report_path") or time.strftime("decode-profile-%Y%m%d-%H%M%S.txt")
+        running[0] = DecodeProfiler(duration=duration, **{**options, "report_path": report_path}).start()
+        print(f"Profiling decoders for {duration:g} s -> {report_path}")
+
+    signal.signal(signum, handle)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from NMEA.NMEA_Stream import decode_log_file
+
+    parser = argparse.ArgumentParser(description="Decode a log with sampled profiling of the decoders.")
+    parser.add_argument("path")
+    parser.add_argument("--every", type=int, default=SAMPLE_EVERY, help="profile one call in N")
+    parser.add_argument("--seconds", type=float, help="stop profiling after this long")
+    parser.add_argument("--samples", type=int, help="stop profiling after this many samples")
+    parser.add_argument("--output", help="write the report here instead of printing it")
+    args = parser.parse_args()
+
+    with DecodeProfiler(args.every, args.seconds, args.samples, args.output) as profiler:
+        for _ in decode_log_file(args.path):
+            pass
+    if args.output is None:
+        print(profiler.report())
@@ -0,0 +1,223 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Records buffered before a bulk write, and the longest a record waits in the buffer
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# File buffer for the text sinks, so a flush is a few large writes
+WRITE_BUFFER_BYTES = 1 << 20
+
+CSV_COLUMNS = ("received", "feed", "kind", "message_type", "mmsi", "latitude", "longitude",
+               "speed_over_ground", "course_over_ground", "true_heading")
+
+_encode_json = json.JSONEncoder(default=str, ensure_ascii=False).encode
+
+
+def record_fields(record):
+    """A decoded record as a dict: AIS dicts as they are, GNSS namedtuples via _asdict(), errors as {"error": ...}."""
+    if isinstance(record, dict):
+        return record
+    if hasattr(record, "_asdict"):
+        return record._asdict()
+    return {"error": str(record)}
+
+
+class BatchSink:
+    """Buffer decoded records and write them in bulk.
+
+    A sink is called like serve_feeds' handle_record, sink(feed, kind,
+    record), so it can be passed straight in; add(kind, record) suits
+    decode_lines and decode_log_file. Each record is converted to a row on
+    the caller's thread, stamped with the time it arrived, and the buffer is
+    written out once it holds `batch_size` rows or is `flush_interval`
+    seconds old. A background thread handles the second case, so a quiet
+    feed is still written promptly. A batch that fails to write stays in
+    the buffer for the next flush; failures on the background thread are
+    counted under counters["errors"]. Call close() (or use `with`) to write
+    the rest.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.rows = []
+        self.counters = {"records": 0, "flushes": 0, "errors": 0}
+        self._lock = threading.Lock()  # held while rows are appended or written
+        self._closed = threading.Event()
+        if flush_interval:
+            threading.Thread(target=self._flush_periodically, args=(flush_interval,), daemon=True).start()
+
+    def row(self, received, feed, kind, fields):
+        """The stored form of one record; defined by each sink."""
+        raise NotImplementedError
+
+    def write(self, rows):
+        """Write a batch of rows in bulk; defined by each sink."""
+        raise NotImplementedError
+
+    def __call__(self, feed, kind, record):
+        row = self.row(time.time(), feed, kind, record_fields(record))
+        with self._lock:
+            rows = self.rows
+            rows.append(row)
+            if len(rows) >= self.batch_size:
+                self._flush()
+
+    def add(self, kind, record, feed=""):
+        self(feed, kind, record)
+
+    def _flush(self):
+        rows = self.rows
+        if rows:
+            self.rows = []
+            try:
+                self.write(rows)
+            except Exception:
+                # Keep the batch for the next flush; the lock is held, so nothing was added meanwhile
+                self.rows = rows
+                raise
+            self.counters["records"] += len(rows)
+            self.counters["flushes"] += 1
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush_periodically(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                # e.g. a full disk or a locked database; the rows stay buffered for the next try
+                self.counters["errors"] += 1
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._close()
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JSONLSink(BatchSink):
+    """One JSON object per line: received, feed (if any), kind, then the record's fields."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 buffer_bytes=WRITE_BUFFER_BYTES):
+        self.file = open(path, "a", buffering=buffer_bytes, encoding="utf-8")
+        super().__init__(batch_size, flush_interval)
+
+    def row(self, received, feed, kind, fields):
+        head = {"received": received, "feed": feed, "kind": kind} if feed else {"received": received, "kind": kind}
+        return _encode_json({**head, **fields})
+
+    def write(self, rows):
+        self.file.write("\n".join(rows))
+        self.file.write("\n")
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class CSVSink(BatchSink):
+    """Fixed columns (CSV_COLUMNS by default); fields a record lacks are left empty, extra ones dropped."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 buffer_bytes=WRITE_BUFFER_BYTES, columns=CSV_COLUMNS):
+        self.columns = columns
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", buffering=buffer_bytes, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        if new_file:
+            self.writer.writerow(columns)
+        super().__init__(batch_size, flush_interval)
+
+    def row(self, received, feed, kind, fields):
+        fields = {**fields, "received": received, "feed": feed, "kind": kind}
+        return [fields.get(column, "") for column in self.columns]
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def _close(self):
+        self.file.close()
+
+
+class SQLiteSink(BatchSink):
+    """Rows in one SQLite table, inserted with executemany, one transaction per batch.
+
+    The database runs in WAL mode with synchronous=NORMAL, so readers can
+    query while the feed is written and a commit does not wait for a full
+    fsync. The common fields get their own columns (`time` is when the
+    record arrived), with an index on (mmsi, time) for per-vessel history.
+    The whole record is kept as JSON in `record`.
+    """
+
+    COLUMNS = ("time", "feed", "kind", "message_type", "mmsi", "latitude", "longitude", "record")
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 table="messages"):
+        # Batches may be written from the flush thread, always under the sink's lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (time REAL, feed TEXT, kind TEXT, message_type INTEGER, "
+                f"mmsi INTEGER, latitude REAL, longitude REAL, record TEXT)")
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_mmsi_time ON {table} (mmsi, time)")
+        self.insert = f"INSERT INTO {table} ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})"
+        super().__init__(batch_size, flush_interval)
+
+    def row(self, received, feed, kind, fields):
+        get = fields.get
+        return (received, feed, kind, get("message_type"), get("mmsi", get("mmsi_1")),
+                get("latitude"), get("longitude"), _encode_json(fields))
+
+    def write(self, rows):
+        with self.connection:
+            self.connection.executemany(self.insert, rows)
+
+    def _close(self):
+        self.connection.close()
+
+
+SINKS = {".jsonl": JSONLSink, ".json": JSONLSink, ".csv": CSVSink, ".db": SQLiteSink, ".sqlite": SQLiteSink}
+
+
+def open_sink(path, **options):
+    """The sink for a path's extension: .jsonl/.json, .csv or .db/.sqlite."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unknown sink type {extension!r}; use one of {', '.join(SINKS)}")
+    return SINKS[extension](path, **options)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from NMEA.NMEA_Stream import decode_log_file
+
+    started = time.perf_counter()
+    with open_sink(sys.argv[2]) as sink:
+        for kind, record in decode_log_file(sys.argv[1]):
+            sink.add(kind, record)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {sink.counters['records']} records in {sink.counters['flushes']} batches to {sys.argv[2]} "
+          f"in {elapsed:.1f} s ({sink.counters['records'] / elapsed:,.0f} records/sec)")
@@ -0,0 +1,109 @@
+import mmap
+import sys
+
+from AIS.AIS_Manual import decode_ais_payload
+from AIS.AIS_Reassembly import FragmentReassembler
+from GNSS.GINAV import parse_ginav_sentence
+from GNSS.GPRMC import parse_gprmc_sentence
+from NMEA.NMEA_Framing import frame_sentence
+
+AIS_PREFIXES = (b"!AIVDM", b"!AIVDO")
+
+
+def iter_lines(path):
+    """Yield the lines of a file as bytes, read through a memory map.
+
+    Only one line is copied out of the mapping at a time, so memory use does
+    not grow with the file size.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty file
+        with mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            find = mm.find
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = find(b"\n", start)
+                if end == -1:
+                    end = size
+                yield mm[start:end]
+                start = end + 1
+
+
+def decode_lines(lines, reassembler=None, source="", counters=None, duplicates=None, prefilter=None, stages=None):
+    """Decode mixed AIS and GNSS NMEA lines, yielding (kind, record) tuples.
+
+    kind is "AIS", "GPRMC" or "GINAV". Lines of any other kind are skipped;
+    a line that fails to decode yields its kind with an error string. Lines
+    with bad framing or checksum are dropped up front and, if a `counters`
+    dict is given, counted under "rejected". AIS messages rejected by the
+    optional `prefilter` (a HeaderFilter) or already seen by `duplicates`
+    are skipped without decoding and counted under "filtered" and
+    "duplicate", and failures under "reassembly_errors" and "decode_errors".
+
+    `stages` optionally replaces the steps of each line with wrappers around
+    them (e.g. timers), as a dict with any of "frame" (frame_sentence), "add"
+    (reassembler.add), "AIS" (decode_ais_payload), "GPRMC" and "GINAV" (the
+    GNSS parsers). The decoders are looked up on every call otherwise, so
+    DecodeProfiler can patch them mid-stream.
+    """
+    reassembler = FragmentReassembler() if reassembler is None else reassembler
+    stages = stages or {}
+    frame = stages.get("frame", frame_sentence)
+    add = stages.get("add", reassembler.add)
+    decode_ais = stages.get("AIS")
+    parse_gprmc = stages.get("GPRMC")
+    parse_ginav = stages.get("GINAV")
+
+    for line in lines:
+        line = frame(line)
+        if line is None:
+            if counters is not None:
+                counters["rejected"] = counters.get("rejected", 0) + 1
+            continue
+        prefix = line[:6]
+        failed = "decode_errors"
+        try:
+            if prefix in AIS_PREFIXES:
+                failed = "reassembly_errors"
+                sentence = line.decode("ascii")
+                message = add(sentence, source)
+                if message is None:
+                    continue
+                if prefilter is not None and not prefilter.accepts(
+                        message[0], sentence.split(',', 5)[4] if prefilter.needs_channel else None):
+                    if counters is not None:
+                        counters["filtered"] = counters.get("filtered", 0) + 1
+                    continue
+                if duplicates is not None and duplicates.is_duplicate(*message):
+                    if counters is not None:
+                        counters["duplicate"] = counters.get("duplicate", 0) + 1
+                    continue
+                failed = "decode_errors"
+                yield "AIS", decode_ais_payload(*message) if decode_ais is None else decode_ais(*message)
+            elif prefix == b"$GPRMC":
+                sentence = line.decode("ascii")
+                yield "GPRMC", parse_gprmc_sentence(sentence) if parse_gprmc is None else parse_gprmc(sentence)
+            elif prefix == b"$GINAV":
+                sentence = line.decode("ascii")
+                yield "GINAV", parse_ginav_sentence(sentence) if parse_ginav is None else parse_ginav(sentence)
+        except Exception as e:
+            if counters is not None:
+                counters[failed] = counters.get(failed, 0) + 1
+            kind = "AIS" if prefix in AIS_PREFIXES else prefix.decode("ascii", "replace").lstrip("!$")
+            yield kind, f"Error decoding message: {e}"
+
+
+def decode_log_file(path, reassembler=None, counters=None, duplicates=None, prefilter=None):
+    """Stream-decode an NMEA log file of any size."""
+    return decode_lines(iter_lines(path), reassembler, path, counters, duplicates, prefilter)
+
+
+if __name__ == "__main__":
+    for kind, record in decode_log_file(sys.argv[1]):
+        print(kind, record)
@@ -0,0 +1,237 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from AIS.AIS_Fleet import POSITION_TYPES
+
+# Fixed-width column files, one per field, in every segment directory
+COLUMNS = {
+    "time": np.float64,   # unix seconds
+    "mmsi": np.uint32,
+    "lat": np.float64,
+    "lon": np.float64,
+    "sog": np.float32,
+    "cog": np.float32,
+}
+
+# MMSI used for positions from our own GNSS receiver ($GPRMC has no MMSI)
+OWN_SHIP_MMSI = 0
+
+# Suffix of a sealed segment's files while they are written, before they replace the originals
+SEALING = ".sealing"
+
+
+class TrackStore:
+    """Append-only on-disk position history in memory-mapped column files.
+
+    Records are buffered and appended to the active segment in batches. When a
+    segment reaches `segment_rows` it is sealed: rows are re-sorted by
+    (mmsi, time) and a per-MMSI row-range index is written, so a track query
+    reads only that vessel's rows from segments overlapping the time window.
+    """
+
+    def __init__(self, directory, segment_rows=1000000, batch_size=10000):
+        self.directory = directory
+        self.segment_rows = segment_rows
+        self.batch_size = batch_size
+        self.buffer = {name: [] for name in COLUMNS}
+        os.makedirs(directory, exist_ok=True)
+
+        self.segments = sorted(name for name in os.listdir(directory) if name.startswith("segment_"))
+        for segment in self.segments:
+            self._recover(segment)
+        if self.segments:
+            # A crash between the last append and its seal leaves a full, unsealed segment
+            meta = self._meta(self.segments[-1])
+            if not meta["sealed"] and meta["rows"] >= segment_rows:
+                self._seal(self.segments[-1], meta)
+        if not self.segments or self._meta(self.segments[-1])["sealed"]:
+            self._start_segment()
+
+    # -- segment bookkeeping -------------------------------------------------
+
+    def _path(self, segment, name):
+        return os.path.join(self.directory, segment, name)
+
+    def _meta(self, segment):
+        with open(self._path(segment, "meta.json")) as f:
+            return json.load(f)
+
+    def _write_meta(self, segment, meta):
+        # Written aside and renamed, so a crash leaves either the old meta or the new one
+        path = self._path(segment, "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _recover(self, segment):
+        """Finish or discard a seal interrupted by a crash."""
+        leftovers = [name for name in os.listdir(os.path.join(self.directory, segment)) if name.endswith(SEALING)]
+        if not leftovers:
+            return
+        # meta.json is marked sealed only once every sorted file is complete
+        sealed = self._meta(segment)["sealed"]
+        for name in leftovers:
+            path = self._path(segment, name)
+            if sealed:
+                os.replace(path, path[:-len(SEALING)])
+            else:
+                os.remove(path)
+
+    def _start_segment(self):
+        segment = f"segment_{len(self.segments):06d}"
+        os.makedirs(os.path.join(self.directory, segment))
+        self._write_meta(segment, {"rows": 0, "sealed": False, "t_min": None, "t_max": None})
+        self.segments.append(segment)
+
+    def _column(self, segment, name, rows):
+        if rows == 0:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(self._path(segment, name), dtype=COLUMNS[name], mode="r", shape=(rows,))
+
+    # -- ingest --------------------------------------------------------------
+
+    def append(self, timestamp, mmsi, lat, lon, sog, cog):
+        buffer = self.buffer
+        buffer["time"].append(timestamp)
+        buffer["mmsi"].append(mmsi)
+        buffer["lat"].append(lat)
+        buffer["lon"].append(lon)
+        buffer["sog"].append(np.nan if sog is None else sog)
+        buffer["cog"].append(np.nan if cog is None else cog)
+        if len(buffer["time"]) >= self.batch_size:
+            self.flush()
+
+    def append_ais(self, record, timestamp=None):
+        """Append a decoded AIS position dict (e.g. from decode_position_report or decode_gps_correction)."""
+        if not isinstance(record, dict) or record.get("message_type") not in POSITION_TYPES:
+            return False
+        # 91 / 181 mean "not available"
+        if not (-90.0 <= record["latitude"] <= 90.0 and -180.0 <= record["longitude"] <= 180.0):
+            return False
+        self.append(time.time() if timestamp is None else timestamp, record["mmsi"], record["latitude"],
+                    record["longitude"], record.get("speed_over_ground"), record.get("course_over_ground"))
+        return True
+
+    def append_gprmc(self, record, mmsi=OWN_SHIP_MMSI):
+        """Append a GPRMCRecord from the GNSS parser."""
+        if record is None or record.time is None or record.latitude is None:
+            return False
+        self.append(record.time.timestamp(), mmsi, record.latitude, record.longitude,
+                    record.speed_knots, record.course_degrees)
+        return True
+
+    def flush(self):
+        """Write buffered records to the active segment, sealing it when full."""
+        while self.buffer["time"]:
+            segment = self.segments[-1]
+            meta = self._meta(segment)
+            room = self.segment_rows - meta["rows"]
+            batch = {name: values[:room] for name, values in self.buffer.items()}
+            self.buffer = {name: values[room:] for name, values in self.buffer.items()}
+
+            # One sequential write per column file per batch, at the end meta.json records;
+            # anything past it is left over from a torn write and is overwritten
+            for name, dtype in COLUMNS.items():
+                path = self._path(segment, name)
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    end = meta["rows"] * np.dtype(dtype).itemsize
+                    f.truncate(end)
+                    f.seek(end)
+                    f.write(np.asarray(batch[name], dtype=dtype).tobytes())
+
+            times = batch["time"]
+            meta["rows"] += len(times)
+            meta["t_min"] = min(times) if meta["t_min"] is None else min(meta["t_min"], min(times))
+            meta["t_max"] = max(times) if meta["t_max"] is None else max(meta["t_max"], max(times))
+            self._write_meta(segment, meta)
+
+            if meta["rows"] >= self.segment_rows:
+                self._seal(segment, meta)
+                self._start_segment()
+
+    def _seal(self, segment, meta):
+        rows = meta["rows"]
+        data = {name: np.array(self._column(segment, name, rows)) for name in COLUMNS}
+        order = np.lexsort((data["time"], data["mmsi"]))
+        # Sorted columns and the index are written aside, then swapped in once meta.json says
+        # sealed; _recover finishes the swap if a crash interrupts it
+        for name in COLUMNS:
+            data[name][order].tofile(self._path(segment, name + SEALING))
+
+        mmsi = data["mmsi"][order]
+        unique, starts = np.unique(mmsi, return_index=True)
+        unique.tofile(self._path(segment, "index_mmsi" + SEALING))
+        np.append(starts, rows).astype(np.int64).tofile(self._path(segment, "index_start" + SEALING))
+
+        meta["sealed"] = True
+        self._write_meta(segment, meta)
+        self._recover(segment)
+
+    # -- queries ---------------------------------------------------------------
+
+    def track(self, mmsi, t_start=-np.inf, t_end=np.inf):
+        """Positions of one vessel between two times, as a dict of NumPy columns sorted by time."""
+        self.flush()
+        parts = []
+        for segment in self.segments:
+            meta = self._meta(segment)
+            rows = meta["rows"]
+            if rows == 0 or meta["t_max"] < t_start or meta["t_min"] > t_end:
+                continue
+
+            if meta["sealed"]:
+                index_mmsi = np.fromfile(self._path(segment, "index_mmsi"), dtype=np.uint32)
+                position = np.searchsorted(index_mmsi, mmsi)
+                if position == len(index_mmsi) or index_mmsi[position] != mmsi:
+                    continue
+                index_start = np.memmap(self._path(segment, "index_start"), dtype=np.int64, mode="r")
+                first, last = int(index_start[position]), int(index_start[position + 1])
+
+                # Rows of one vessel are time sorted, so the window is a contiguous slice
+                times = self._column(segment, "time", rows)[first:last]
+                lo = first + int(np.searchsorted(times, t_start, side="left"))
+                hi = first + int(np.searchsorted(times, t_end, side="right"))
+                if lo < hi:
+                    parts.append({name: np.array(self._column(segment, name, rows)[lo:hi]) for name in COLUMNS})
+            else:
+                # The active segment is bounded by segment_rows, so a vectorized scan is cheap
+                times = self._column(segment, "time", rows)
+                mask = (self._column(segment, "mmsi", rows) == mmsi) & (times >= t_start) & (times <= t_end)
+                if mask.any():
+                    part = {name: np.array(self._column(segment, name, rows)[mask]) for name in COLUMNS}
+                    order = np.argsort(part["time"], kind="stable")
+                    parts.append({name: values[order] for name, values in part.items()})
+
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+        order = np.argsort(merged["time"], kind="stable")
+        return {name: values[order] for name, values in merged.items()}
+
+    def close(self):
+        self.flush()
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+    import tempfile
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp(prefix="tracks_")
+    store = TrackStore(directory, segment_rows=200000)
+
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for i in range(500000):
+        store.append_ais({"message_type": 1, "mmsi": 200000000 + rng.randrange(5000), "latitude": rng.uniform(-60, 60),
+                          "longitude": rng.uniform(-180, 180), "speed_over_ground": 12.3,
+                          "course_over_ground": 45.0}, timestamp=1700000000 + i)
+    store.flush()
+    print(f"Ingested 500000 positions in {time.perf_counter() - started:.2f} s into {directory}")
+
+    started = time.perf_counter()
+    track = store.track(200000042, 1700100000, 1700300000)
+    print(f"Track of 200000042: {len(track['time'])} fixes in {(time.perf_counter() - started) * 1000:.2f} ms")
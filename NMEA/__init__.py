@@ -0,0 +1 @@
+"""Shared NMEA framing plus streaming, live feed, indexing and diagnostics tools."""
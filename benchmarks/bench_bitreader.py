@@ -0,0 +1,58 @@
+"""Compare the integer bit reader in AIS_Manual against the old '0'/'1' string path.
+
+Run from the repository root:
+    python -m benchmarks.bench_bitreader
+"""
+import timeit
+
+from AIS.AIS_Manual import decode_ais_message, nmea_sentences
+
+
+def legacy_sixbit_to_binary(payload):
+    """The original string-building conversion, kept here as the baseline."""
+    sixbit_map = "0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVW`abcdefghijklmnopqrstuvw"
+    binary_string = ""
+
+    for char in payload:
+        index = sixbit_map.index(char)
+        binary_string += format(index, '06b')
+
+    return binary_string
+
+
+def legacy_decode_position_report(binary_data):
+    """The original slice-and-int() position report decoder."""
+    return {
+        "message_type": int(binary_data[0:6], 2),
+        "mmsi": int(binary_data[8:38], 2),
+        "longitude": int(binary_data[61:89], 2) / 600000.0,
+        "latitude": int(binary_data[89:116], 2) / 600000.0,
+        "speed_over_ground": int(binary_data[50:60], 2) / 10.0,
+        "course_over_ground": int(binary_data[116:128], 2) / 10.0,
+        "true_heading": int(binary_data[128:137], 2),
+    }
+
+
+def legacy_decode(nmea_message):
+    binary_data = legacy_sixbit_to_binary(nmea_message.split(',')[5])
+    if int(binary_data[0:6], 2) in [1, 2, 3]:
+        return legacy_decode_position_report(binary_data)
+    return None
+
+
+def run(number=20000):
+    # Only the position reports, so both paths do the same work
+    sentences = [s for s in nmea_sentences if legacy_decode(s) is not None]
+
+    legacy = timeit.timeit(lambda: [legacy_decode(s) for s in sentences], number=number)
+    current = timeit.timeit(lambda: [decode_ais_message(s) for s in sentences], number=number)
+
+    total = number * len(sentences)
+    print(f"Sentences decoded per path: {total}")
+    print(f"String path:     {total / legacy:,.0f} sentences/sec")
+    print(f"Bit reader path: {total / current:,.0f} sentences/sec")
+    print(f"Speedup:         {legacy / current:.2f}x")
+
+
+if __name__ == "__main__":
+    run()
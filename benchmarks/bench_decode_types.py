@@ -0,0 +1,27 @@
+"""Per-message-type decode cost of the compiled AIS_Manual decoders.
+
+Run from the repository root:
+    python -m benchmarks.bench_decode_types
+"""
+import random
+import timeit
+
+from AIS.AIS_Manual import DECODERS, SIXBIT_MAP, sixbit_to_binary
+
+
+def random_payload(message_type, rng, chars=72):
+    """A payload of the given type with random contents (long enough for every layout)."""
+    return SIXBIT_MAP[message_type] + "".join(rng.choice(SIXBIT_MAP) for _ in range(chars - 1))
+
+
+def run(number=50000, seed=0):
+    rng = random.Random(seed)
+    print(f"{'type':>4}  {'ns/decode':>10}  {'decodes/sec':>12}")
+    for message_type, decoder in sorted(DECODERS.items()):
+        bits = sixbit_to_binary(random_payload(message_type, rng))
+        elapsed = timeit.timeit(lambda: decoder(bits), number=number)
+        print(f"{message_type:>4}  {elapsed / number * 1e9:>10.0f}  {number / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,232 @@
+"""Reproducible throughput, latency and memory benchmarks for every decoder path.
+
+Each path decodes a seeded corpus of valid sentences per message type and
+reports sentences/sec (best of --repeat runs), per-sentence latency
+percentiles and the peak traced memory of one pass over the corpus.
+
+Run from the repository root:
+    python -m benchmarks.bench_suite --output results.json
+    python -m benchmarks.bench_suite --baseline results.json  # flag regressions
+
+With --baseline the exit status is 1 if any result is worse than the
+baseline by more than --threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from AIS.AIS_Manual import SIXBIT_MAP
+from NMEA.NMEA_Framing import nmea_checksum
+
+# (payload characters, fill bits) of a well-formed single-sentence message per type
+AIS_LAYOUTS = {
+    1: (28, 0), 2: (28, 0), 3: (28, 0), 4: (28, 0), 5: (71, 2),
+    18: (28, 0), 19: (52, 0), 21: (46, 0), 24: (28, 0), 27: (16, 0),
+}
+
+PERCENTILES = (50, 90, 99)
+
+# Metrics where a higher value is worse (throughput is checked the other way round)
+LATENCY_METRICS = tuple(f"p{p}_us" for p in PERCENTILES) + ("peak_kib",)
+
+
+def frame(body, start="!"):
+    return f"{start}{body}*{nmea_checksum(body):02X}"
+
+
+def ais_corpus(message_type, count, rng):
+    chars, fill_bits = AIS_LAYOUTS[message_type]
+    sentences = []
+    for _ in range(count):
+        values = [message_type] + [rng.randrange(64) for _ in range(chars - 1)]
+        if message_type == 24:
+            values[6] &= 0b110111  # part number (bits 38-39) must be 0 or 1
+        payload = "".join(SIXBIT_MAP[value] for value in values)
+        sentences.append(frame(f"AIVDM,1,1,,{rng.choice('AB')},{payload},{fill_bits}"))
+    return sentences
+
+
+def _nmea_coordinate(value, degree_digits):
+    degrees = int(abs(value))
+    return f"{degrees:0{degree_digits}d}{(abs(value) - degrees) * 60:07.4f}"
+
+
+def gprmc_corpus(count, rng):
+    sentences = []
+    for _ in range(count):
+        lat, lon = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        body = (f"GPRMC,{rng.randrange(24):02d}{rng.randrange(60):02d}{rng.uniform(0, 59.999):07.4f},A,"
+                f"{_nmea_coordinate(lat, 2)},{'N' if lat >= 0 else 'S'},"
+                f"{_nmea_coordinate(lon, 3)},{'E' if lon >= 0 else 'W'},"
+                f"{rng.uniform(0, 30):.5f},{rng.uniform(0, 360):.4f},"
+                f"{rng.randint(1, 28):02d}{rng.randint(1, 12):02d}{rng.randrange(100):02d},,,A")
+        sentences.append(frame(body, "$"))
+    return sentences
+
+
+def ginav_corpus(count, rng):
+    sentences = []
+    for _ in range(count):
+        lat, lon = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        body = (f"GINAV,{rng.randint(0, 2)},{rng.randint(2000, 2030)},"
+                f"{abs(lat):.4f},{'N' if lat >= 0 else 'S'},{abs(lon):.4f},{'E' if lon >= 0 else 'W'},"
+                f"{rng.randint(4, 24)},{rng.uniform(0.5, 5):.1f},{rng.uniform(-10, 500):.1f},M,"
+                f"{rng.uniform(-50, 50):.1f},M,")
+        sentences.append(frame(body, "$"))
+    return sentences
+
+
+def build_corpora(count, seed):
+    """Corpora keyed by name; each gets its own generator so adding one does not shift the others."""
+    corpora = {}
+    for message_type in AIS_LAYOUTS:
+        corpora[f"ais_type_{message_type}"] = ais_corpus(message_type, count, random.Random(f"{seed}:{message_type}"))
+    corpora["gprmc"] = gprmc_corpus(count, random.Random(f"{seed}:gprmc"))
+    corpora["ginav"] = ginav_corpus(count, random.Random(f"{seed}:ginav"))
+    return corpora
+
+
+def load_paths():
+    """(name, function, corpus names) for every decoder path whose dependencies are available."""
+    from AIS.AIS_Lazy import lazy_ais_message
+    from AIS.AIS_Manual import decode_ais_message as manual_decode
+    from GNSS.GINAV import parse_ginav_sentence
+    from GNSS.GPRMC import parse_gprmc_sentence
+
+    all_ais = [f"ais_type_{message_type}" for message_type in AIS_LAYOUTS]
+    paths = [("AIS_Manual.decode_ais_message", manual_decode, all_ais)]
+
+    def lazy_filter(sentence):
+        # What a filter-only consumer does: read type and MMSI, never touch the rest
+        message = lazy_ais_message(sentence)
+        return message.message_type, message.mmsi
+
+    paths.append(("AIS_Lazy.lazy_ais_message", lazy_filter, all_ais))
+
+    try:
+        import pyais
+
+        from AIS import AIS_pyais
+    except ImportError:
+        print("pyais is not installed; skipping the pyais paths", file=sys.stderr)
+    else:
+        paths.append(("AIS_pyais.decode_ais_message", AIS_pyais.decode_ais_message, all_ais))
+        paths.append(("pyais.decode", pyais.decode, all_ais))
+
+    paths.append(("GPRMC.parse_gprmc_sentence", parse_gprmc_sentence, ["gprmc"]))
+    paths.append(("GINAV.parse_ginav_sentence", parse_ginav_sentence, ["ginav"]))
+    return paths
+
+
+def _percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def measure(function, sentences, repeat):
+    # Throughput: best of several timed passes with nothing else in the loop
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for sentence in sentences:
+            function(sentence)
+        best = min(best, time.perf_counter() - started)
+
+    perf_counter_ns = time.perf_counter_ns
+    latencies = []
+    for sentence in sentences:
+        started = perf_counter_ns()
+        function(sentence)
+        latencies.append(perf_counter_ns() - started)
+    latencies.sort()
+
+    # Peak memory of decoding the whole corpus and keeping the results
+    tracemalloc.start()
+    results = [function(sentence) for sentence in sentences]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+
+    measured = {"sentences": len(sentences), "sentences_per_sec": round(len(sentences) / best, 1)}
+    for percent in PERCENTILES:
+        measured[f"p{percent}_us"] = round(_percentile(latencies, percent) / 1000, 3)
+    measured["peak_kib"] = round(peak / 1024, 1)
+    return measured
+
+
+def run(count=2000, repeat=5, seed=0, only=None):
+    corpora = build_corpora(count, seed)
+    results = {}
+    for name, function, corpus_names in load_paths():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for corpus_name in corpus_names:
+            results[f"{name}/{corpus_name}"] = measure(function, corpora[corpus_name], repeat)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "count": count, "repeat": repeat, "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Return (key, metric, baseline value, current value) for every result worse than the threshold."""
+    regressions = []
+    for key, current in report["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        if current["sentences_per_sec"] < previous["sentences_per_sec"] * (1 - threshold):
+            regressions.append((key, "sentences_per_sec", previous["sentences_per_sec"], current["sentences_per_sec"]))
+        for metric in LATENCY_METRICS:
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append((key, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def print_report(report):
+    print(f"{'path / corpus':<60} {'sent/sec':>12} {'p50 us':>8} {'p90 us':>8} {'p99 us':>8} {'peak KiB':>9}")
+    for key, result in report["results"].items():
+        print(f"{key:<60} {result['sentences_per_sec']:>12,.0f} {result['p50_us']:>8.2f} "
+              f"{result['p90_us']:>8.2f} {result['p99_us']:>8.2f} {result['peak_kib']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every AIS and GNSS decoder path.")
+    parser.add_argument("--count", type=int, default=2000, help="sentences per corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes per corpus; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="*", help="run only paths whose name contains one of these")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    report = run(args.count, args.repeat, args.seed, args.only)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for key, metric, previous, current in regressions:
+            print(f"REGRESSION {key} {metric}: {previous} -> {current}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()